@@ -0,0 +1,151 @@
+"""Controle de admissão: limita requisições concorrentes à capacidade do pool."""
+
+import asyncio
+import logging
+from collections import deque
+from functools import lru_cache
+
+from fastapi import Request
+
+from app.core.config import get_settings
+from app.core.exceptions import ServiceOverloadedException
+
+logger = logging.getLogger(__name__)
+
+
+class WeightedLimiter:
+    """
+    Limita a soma dos pesos das requisições em andamento.
+
+    Requisições que não cabem na capacidade aguardam em uma fila FIFO limitada;
+    quando a fila está cheia ou a espera excede o tempo máximo, são rejeitadas
+    imediatamente em vez de aguardar pelo pool de conexões.
+    """
+
+    def __init__(self, capacity: int, max_queue: int, max_wait: float):
+        """Inicializa o limitador com capacidade, tamanho da fila e espera máxima."""
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._in_use = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self, weight: int) -> None:
+        """
+        Reserva capacidade para uma requisição, aguardando na fila se necessário.
+
+        Args:
+            weight: Peso da requisição
+
+        Raises:
+            ServiceOverloadedException: Se a fila estiver cheia ou a espera expirar
+        """
+        weight = min(weight, self.capacity)
+
+        if not self._waiters and self._in_use + weight <= self.capacity:
+            self._in_use += weight
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise ServiceOverloadedException()
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (weight, future)
+        self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+        except asyncio.TimeoutError:
+            self._remove_waiter(waiter)
+            self.rejected += 1
+            raise ServiceOverloadedException()
+        except asyncio.CancelledError:
+            self._remove_waiter(waiter)
+            # A capacidade pode ter sido concedida no mesmo instante do cancelamento
+            if future.done() and not future.cancelled():
+                self.release(weight)
+            raise
+
+        self.admitted += 1
+
+    def release(self, weight: int) -> None:
+        """Libera a capacidade reservada e admite as próximas requisições da fila."""
+        self._in_use -= min(weight, self.capacity)
+        self._wake_waiters()
+
+    def _remove_waiter(self, waiter: tuple) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self._in_use + weight > self.capacity:
+                break
+            self._waiters.popleft()
+            self._in_use += weight
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        """
+        Retorna o estado atual do limitador.
+
+        Returns:
+            Dicionário com capacidade, peso em uso, fila e contadores
+        """
+        return {
+            "capacity": self.capacity,
+            "in_use": self._in_use,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+@lru_cache()
+def get_admission_limiter() -> WeightedLimiter:
+    """Get cached admission limiter sized to the database pool."""
+    settings = get_settings()
+    capacity = settings.ADMISSION_CAPACITY or (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    return WeightedLimiter(
+        capacity=capacity,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        max_wait=settings.ADMISSION_MAX_WAIT,
+    )
+
+
+async def admission_control(request: Request):
+    """Dependency that admits the request according to its endpoint weight."""
+    settings = get_settings()
+    route = request.scope.get("route")
+    weight = settings.ADMISSION_WEIGHTS.get(getattr(route, "name", None), 1)
+    if weight <= 0:
+        # Endpoints que não usam o banco não ocupam nem aguardam capacidade
+        yield
+        return
+
+    limiter = get_admission_limiter()
+    try:
+        await limiter.acquire(weight)
+    except ServiceOverloadedException:
+        logger.warning(
+            f"Requisição rejeitada por sobrecarga em {request.url.path} ({limiter.stats()})"
+        )
+        raise
+
+    try:
+        yield
+    finally:
+        limiter.release(weight)
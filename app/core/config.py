@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,6 +11,11 @@ class Settings(BaseSettings):
         env_file=".env", case_sensitive=True, extra="ignore"
     )
 
+    # Database backend: "postgresql" (PostGIS) ou "spatialite" (SQLite embarcado)
+    DB_BACKEND: str = "postgresql"
+    SPATIALITE_PATH: str = "fazendas.sqlite"
+    SPATIALITE_LIBRARY_PATH: str = "mod_spatialite"
+
     # Database
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
@@ -23,6 +29,84 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
 
+    # Database query deadlines (statement_timeout por endpoint, em ms)
+    DB_STATEMENT_TIMEOUT_MS: int = 10000
+    DB_STATEMENT_TIMEOUTS: dict[str, int] = {
+        "get_fazenda": 2000,
+        "busca_ponto": 2000,
+        "busca_raio": 5000,
+        "busca_area": 5000,
+        "mapa_clusters": 5000,
+        "exportar_raio": 30000,
+        "exportar_area": 30000,
+    }
+    REQUEST_DEADLINE_HEADER: str = "X-Request-Deadline"
+    DISCONNECT_POLL_INTERVAL: float = 0.25
+
+    # Controle de admissão (capacidade padrão: DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    ADMISSION_CAPACITY: Optional[int] = None
+    ADMISSION_WEIGHTS: dict[str, int] = {
+        "busca_raio": 2,
+        "busca_area": 2,
+        "mapa_clusters": 2,
+        "exportar_raio": 2,
+        "exportar_area": 2,
+        # Rotas de jobs não usam o pool de requisições: upload e leitura de estado em disco
+        "criar_job": 0,
+        "consultar_job": 0,
+        "resultado_job": 0,
+    }
+    ADMISSION_MAX_QUEUE: int = 50
+    ADMISSION_MAX_WAIT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # Coalescência de consultas idênticas concorrentes
+    QUERY_COALESCING_ENABLED: bool = True
+
+    # Health check
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+    HEALTH_STALE_AFTER: float = 30.0
+    HEALTH_POOL_SATURATION_THRESHOLD: float = 0.9
+
+    # Aquecimento na inicialização
+    DB_WARMUP_ENABLED: bool = True
+    DB_PREWARM: bool = False  # pg_prewarm nos índices GIST (requer a extensão)
+
+    # Particionamento de area_imovel_1 por cod_estado (LIST)
+    DB_PARTITION_BY_ESTADO: bool = False
+
+    # Geometrias subdivididas (ST_Subdivide)
+    SUBDIVIDE_MAX_VERTICES: int = 256
+
+    # Busca por área
+    AREA_MAX_VERTICES: int = 1000
+    AREA_MAX_KM2: float = 500000.0
+
+    # Clusters para mapas
+    CLUSTER_GRID_CELLS_PER_TILE: int = 4
+    CLUSTER_MAX_CELLS: int = 10000
+    CLUSTER_CACHE_MAX_AGE: int = 300
+
+    # ETags: por quanto tempo (s) a versão da tabela é reaproveitada sem consultar o banco
+    ETAG_VERSION_TTL: float = 1.0
+
+    # Exportação (GeoParquet / Arrow IPC)
+    EXPORT_BATCH_SIZE: int = 5000
+
+    # Jobs de cruzamento de pontos em lote
+    JOBS_DIR: str = "jobs"
+    JOBS_WORKERS: int = 2
+    JOBS_CHUNK_SIZE: int = 2000
+    JOBS_MAX_UPLOAD_MB: int = 100
+    JOBS_STATEMENT_TIMEOUT_MS: int = 30000
+    JOBS_RETENTION_HOURS: float = 24.0  # jobs concluídos ou com falha são removidos depois disso
+    JOBS_CLEANUP_INTERVAL: float = 3600.0
+
+    # Geofence (WebSocket de posições de dispositivos)
+    GEOFENCE_RECHECK_EVERY: int = 10  # posições resolvidas localmente antes de nova consulta
+    GEOFENCE_MAX_DEVICES: int = 1000  # dispositivos por conexão
+
     # API
     API_TITLE: str = "Fazendas API"
     API_VERSION: str = "1.0.0"
@@ -37,10 +121,17 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    @property
+    def is_spatialite(self) -> bool:
+        """Whether the embedded SpatiaLite backend is selected."""
+        return self.DB_BACKEND == "spatialite"
+
     @property
     def database_url(self) -> str:
-        """Construct database URL from components."""
-        return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        """Construct database URL from components, pinning the psycopg 3 driver."""
+        if self.is_spatialite:
+            return f"sqlite:///{self.SPATIALITE_PATH}"
+        return f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
 
 @lru_cache()
@@ -1,31 +1,250 @@
-from sqlalchemy import Index, create_engine
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Union
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import Index, create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.core.config import get_settings
+from app.core.exceptions import (
+    BackendNotSupportedException,
+    DatabaseException,
+    QueryTimeoutException,
+)
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Create engine with connection pooling
-engine = create_engine(
-    settings.database_url,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=False,  # Set to True for SQL query logging
-)
+# SQLSTATE do PostgreSQL para consultas canceladas (statement_timeout ou cancelamento)
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+def _create_engine() -> Engine:
+    """Build the engine for the configured backend."""
+    if settings.is_spatialite:
+        # Embedded SpatiaLite database (tests and edge deployments)
+        from geoalchemy2.admin.dialects.sqlite import load_spatialite
+
+        os.environ.setdefault("SPATIALITE_LIBRARY_PATH", settings.SPATIALITE_LIBRARY_PATH)
+
+        if settings.SPATIALITE_PATH == ":memory:":
+            # A single shared connection, otherwise each connection sees an empty database
+            engine = create_engine(
+                settings.database_url,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+        else:
+            engine = create_engine(
+                settings.database_url,
+                connect_args={"check_same_thread": False},
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+
+        @event.listens_for(engine, "connect")
+        def _load_spatialite(dbapi_connection, connection_record):
+            load_spatialite(dbapi_connection, init_mode="WGS84")
+
+        return engine
+
+    # Create engine with connection pooling
+    return create_engine(
+        settings.database_url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,  # Verify connections before using
+        echo=False,  # Set to True for SQL query logging
+    )
+
+
+@lru_cache()
+def get_engine() -> Engine:
+    """
+    Get the engine, creating it on first use.
+
+    Creating the engine imports the DB-API driver, so it is deferred until the
+    application lifespan (or the first script/test that needs it) instead of
+    happening at import time.
+    """
+    return _create_engine()
+
+
+@lru_cache()
+def get_session_factory() -> sessionmaker:
+    """Get the session factory bound to the engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def __getattr__(name: str):
+    # `engine` e `SessionLocal` continuam importáveis, construídos no primeiro acesso
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database session."""
-    db = SessionLocal()
+class QueryCanceller:
+    """Cancels the query running on the connection bound to a request."""
+
+    def __init__(self):
+        self._dbapi_connection = None
+        self._lock = threading.Lock()
+        self.cancelled = False
+
+    def attach(self, dbapi_connection) -> None:
+        with self._lock:
+            self._dbapi_connection = dbapi_connection
+
+    def detach(self) -> None:
+        with self._lock:
+            self._dbapi_connection = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._dbapi_connection is not None and not self.cancelled:
+                # psycopg expõe cancel(); sqlite3 expõe interrupt()
+                cancel = getattr(self._dbapi_connection, "cancel", None) or getattr(
+                    self._dbapi_connection, "interrupt"
+                )
+                cancel()
+                self.cancelled = True
+
+
+async def cancel_on_disconnect(request: Request):
+    """Dependency that cancels the running query when the client disconnects."""
+    canceller = QueryCanceller()
+
+    async def watch_disconnect():
+        while not await request.is_disconnected():
+            await asyncio.sleep(settings.DISCONNECT_POLL_INTERVAL)
+        logger.warning(f"Cliente desconectou, cancelando consulta em {request.url.path}")
+        await asyncio.to_thread(canceller.cancel)
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        yield canceller
+    finally:
+        watcher.cancel()
+
+
+def statement_timeout_ms(request: Request) -> int:
+    """Compute the statement timeout for a request from its route and deadline header."""
+    route = request.scope.get("route")
+    timeout = settings.DB_STATEMENT_TIMEOUTS.get(
+        getattr(route, "name", None), settings.DB_STATEMENT_TIMEOUT_MS
+    )
+
+    deadline = request.headers.get(settings.REQUEST_DEADLINE_HEADER)
+    if deadline:
+        try:
+            budget = int(deadline)
+        except ValueError:
+            logger.warning(f"Header {settings.REQUEST_DEADLINE_HEADER} inválido: {deadline}")
+        else:
+            start_time = getattr(request.state, "start_time", time.time())
+            remaining = budget - int((time.time() - start_time) * 1000)
+            if remaining <= 0:
+                raise QueryTimeoutException("Prazo da requisição expirado")
+            timeout = min(timeout, remaining)
+
+    return timeout
+
+
+def is_query_cancelled(error: SQLAlchemyError) -> bool:
+    """Check whether a database error was caused by a timeout or cancellation."""
+    orig = getattr(error, "orig", None)
+    if isinstance(orig, sqlite3.OperationalError):
+        # sqlite3 interrompido por Connection.interrupt()
+        return str(orig) == "interrupted"
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return sqlstate == QUERY_CANCELED_SQLSTATE
+
+
+def database_error(
+    error: SQLAlchemyError, context: str, message: str = "Erro ao acessar banco de dados"
+) -> HTTPException:
+    """
+    Translate a database error into the HTTP exception a route should raise.
+
+    Args:
+        error: Error raised by the query
+        context: Description of the operation, used in the log message
+        message: Detail of the 500 response
+
+    Returns:
+        QueryTimeoutException (504) for timeouts and cancellations,
+        DatabaseException (500) otherwise
+    """
+    if is_query_cancelled(error):
+        logger.warning(f"Consulta cancelada {context}: {str(error)}")
+        return QueryTimeoutException()
+    logger.error(f"Erro de banco de dados {context}: {str(error)}")
+    return DatabaseException(message)
+
+
+def set_statement_timeout(db: Union[Session, Connection], timeout_ms: int) -> None:
+    """Limit the duration of the queries in the current transaction."""
+    if not settings.is_spatialite:
+        db.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": f"{timeout_ms}ms"},
+        )
+
+
+def get_db(
+    request: Request,
+    canceller: QueryCanceller = Depends(cancel_on_disconnect),
+):
+    """
+    Dependency for getting database session.
+
+    The session is lazy: a pooled connection is only checked out when the
+    first query begins a transaction, so requests answered without touching
+    the database (304 responses, redirects, coalesced waits) hold none.
+
+    Successful requests end their transaction with COMMIT rather than
+    ROLLBACK: psycopg 3 deallocates every prepared statement of the
+    connection on rollback, which would discard the statements prepared by
+    the warm-up and by earlier requests.
+    """
+    timeout = statement_timeout_ms(request)
+    db = get_session_factory()()
+
+    @event.listens_for(db, "after_begin")
+    def _configure_transaction(session, transaction, connection):
+        # Vale apenas para a transação que está começando
+        set_statement_timeout(connection, timeout)
+        canceller.attach(connection.connection.dbapi_connection)
+
     try:
         yield db
+        if db.in_transaction():
+            db.commit()
     finally:
+        canceller.detach()
         db.close()
+
+
+def require_postgresql():
+    """Dependency for endpoints that rely on PostgreSQL-only features."""
+    if settings.is_spatialite:
+        raise BackendNotSupportedException()
@@ -3,6 +3,8 @@ import logging
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from app.core.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +31,59 @@ class DatabaseException(HTTPException):
         super().__init__(status_code=500, detail=message)
 
 
+class QueryTimeoutException(HTTPException):
+    """Exception raised when a query exceeds its deadline or is cancelled."""
+
+    def __init__(self, message: str = "Tempo limite da consulta excedido"):
+        super().__init__(status_code=504, detail=message)
+
+
+class ServiceOverloadedException(HTTPException):
+    """Exception raised when a request is rejected by admission control."""
+
+    def __init__(self, message: str = "Serviço sobrecarregado, tente novamente"):
+        super().__init__(
+            status_code=503,
+            detail=message,
+            headers={"Retry-After": str(get_settings().ADMISSION_RETRY_AFTER)},
+        )
+
+
+class BackendNotSupportedException(HTTPException):
+    """Exception raised when an endpoint is not available on the configured database backend."""
+
+    def __init__(
+        self, message: str = "Funcionalidade não disponível no backend de banco de dados configurado"
+    ):
+        super().__init__(status_code=501, detail=message)
+
+
+class JobNotFoundException(HTTPException):
+    """Exception raised when a background job is not found."""
+
+    def __init__(self, job_id: str):
+        super().__init__(status_code=404, detail=f"Job {job_id} não encontrado")
+
+
+class JobNotReadyException(HTTPException):
+    """Exception raised when the result of a job is requested before it completes."""
+
+    def __init__(self, job_id: str, status: str):
+        super().__init__(
+            status_code=409,
+            detail=f"Resultado do job {job_id} indisponível (status: {status})",
+        )
+
+
+class UploadTooLargeException(HTTPException):
+    """Exception raised when an uploaded file exceeds the configured limit."""
+
+    def __init__(self, max_mb: int):
+        super().__init__(
+            status_code=413, detail=f"Arquivo excede o limite de {max_mb} MB"
+        )
+
+
 async def database_exception_handler(request: Request, exc: DatabaseException):
     """Handle database exceptions with proper logging."""
     logger.error(f"Database error on {request.url}: {exc.detail}")
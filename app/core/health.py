@@ -0,0 +1,264 @@
+"""Monitoramento de saúde da API: liveness, readiness e estado do pool de conexões."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.core.admission import get_admission_limiter
+from app.core.config import get_settings
+from app.core.database import get_engine
+from app.core.singleflight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class QueryLatencyTracker:
+    """Mantém uma janela das latências das consultas recentes executadas no engine."""
+
+    def __init__(self, window: int = 256):
+        """Inicializa o rastreador com o tamanho da janela de amostras."""
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        """Registra os listeners de execução de cursor no engine."""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get("query_start_time")
+        if start_times:
+            self.record(time.perf_counter() - start_times.pop())
+
+    def record(self, seconds: float) -> None:
+        """Registra a duração de uma consulta em segundos."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def snapshot(self) -> dict:
+        """
+        Retorna estatísticas das latências na janela atual.
+
+        Returns:
+            Dicionário com número de amostras, p50, p95 e máximo em milissegundos
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+
+        if not samples:
+            return {"samples": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        def percentile(p: float) -> float:
+            index = min(len(samples) - 1, int(round(p * (len(samples) - 1))))
+            return round(samples[index] * 1000, 3)
+
+        return {
+            "samples": len(samples),
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(samples[-1] * 1000, 3),
+        }
+
+
+class HealthProber:
+    """
+    Verifica periodicamente o banco de dados em segundo plano e mantém o estado em cache.
+
+    Os endpoints de health apenas leem o estado em cache, sem bloquear o event loop
+    com I/O de banco de dados. A saturação do pool é calculada no momento da leitura,
+    pois depende apenas de contadores em memória.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        interval: float,
+        timeout: float,
+        stale_after: float,
+        saturation_threshold: float,
+    ):
+        """Inicializa o prober com o engine e os parâmetros de verificação."""
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.saturation_threshold = saturation_threshold
+        self.latency = QueryLatencyTracker()
+        self._latency_installed = False
+        self._state: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[asyncio.Future] = None
+
+    async def start(self) -> None:
+        """Executa a primeira verificação e inicia o loop em segundo plano."""
+        if not self._latency_installed:
+            self.latency.install(self.engine)
+            self._latency_installed = True
+        await self.probe_once()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Interrompe o loop de verificação."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.probe_once()
+
+    async def probe_once(self) -> None:
+        """Executa uma verificação do banco de dados e atualiza o estado em cache."""
+        if self.pool_status()["saturated"] and self._state is not None:
+            # Não disputa conexões com as requisições quando o pool está esgotado.
+            # O último resultado e seu checked_at são mantidos: após HEALTH_STALE_AFTER
+            # sem verificação, o estado do banco passa a ser desconhecido
+            logger.warning("Pool de conexões saturado, verificação do banco adiada")
+            self._state = {**self._state, "deferred": True}
+            return
+
+        # Uma verificação travada não é disparada novamente até terminar
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.ensure_future(asyncio.to_thread(self._probe_database))
+
+        try:
+            database = await asyncio.wait_for(asyncio.shield(self._pending), self.timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Verificação do banco excedeu {self.timeout}s")
+            database = {"status": "disconnected", "error": "timeout na verificação"}
+        except Exception as e:
+            logger.error(f"Verificação do banco falhou: {str(e)}")
+            database = {"status": "disconnected", "error": str(e)}
+
+        self._state = {"database": database, "checked_at": time.time(), "deferred": False}
+
+    def _probe_database(self) -> dict:
+        start_time = time.perf_counter()
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == "postgresql":
+                in_recovery, replication_lag = conn.execute(
+                    text(
+                        "SELECT pg_is_in_recovery(), "
+                        "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+                    )
+                ).one()
+            else:
+                conn.execute(text("SELECT 1"))
+                in_recovery, replication_lag = False, None
+        latency_ms = round((time.perf_counter() - start_time) * 1000, 3)
+
+        if not in_recovery or replication_lag is None:
+            replication_lag = None
+
+        return {
+            "status": "connected",
+            "latency_ms": latency_ms,
+            "replica": {
+                "in_recovery": bool(in_recovery),
+                "lag_seconds": float(replication_lag) if replication_lag is not None else None,
+            },
+        }
+
+    def pool_status(self) -> dict:
+        """
+        Retorna a utilização atual do pool de conexões.
+
+        Returns:
+            Dicionário com conexões em uso, capacidade, utilização e indicador de saturação
+        """
+        pool = self.engine.pool
+        # Pools sem contadores (StaticPool, SingletonThreadPool do SQLite) contam como vazios
+        checked_out = pool.checkedout() if callable(getattr(pool, "checkedout", None)) else 0
+        size = pool.size() if callable(getattr(pool, "size", None)) else 0
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        capacity = max(size + max(max_overflow, 0), 1)
+        utilization = checked_out / capacity
+
+        return {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "utilization": round(utilization, 3),
+            "saturated": utilization >= self.saturation_threshold,
+        }
+
+    def status(self) -> dict:
+        """
+        Monta o estado de saúde a partir do cache, sem acessar o banco de dados.
+
+        Returns:
+            Dicionário com status, banco de dados, pool, latência e coalescência das consultas
+        """
+        pool = self.pool_status()
+
+        if self._state is None:
+            return {
+                "status": "starting",
+                "ready": False,
+                "database": {"status": "unknown"},
+                "pool": pool,
+                "queries": self.latency.snapshot(),
+                "coalescing": get_single_flight().stats(),
+                "admission": get_admission_limiter().stats(),
+            }
+
+        database = dict(self._state["database"])
+        age = time.time() - self._state["checked_at"]
+        database["checked_seconds_ago"] = round(age, 3)
+        deferred = self._state.get("deferred", False)
+        database["probe_deferred"] = deferred
+
+        stale = age > self.stale_after
+        if stale and deferred:
+            # Sem verificação desde a saturação do pool, o último resultado não vale mais
+            database["status"] = "unknown"
+
+        connected = database["status"] == "connected"
+        ready = connected and not stale and not pool["saturated"]
+
+        if stale and deferred:
+            # Não pronto, mas sem indicar o banco como fora do ar só pela saturação
+            status = "saturated"
+        elif not connected or stale:
+            status = "unhealthy"
+        elif pool["saturated"]:
+            status = "saturated"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "ready": ready,
+            "database": database,
+            "pool": pool,
+            "queries": self.latency.snapshot(),
+            "coalescing": get_single_flight().stats(),
+            "admission": get_admission_limiter().stats(),
+        }
+
+
+@lru_cache()
+def get_health_prober() -> HealthProber:
+    """Get cached health prober instance."""
+    settings = get_settings()
+    return HealthProber(
+        get_engine(),
+        interval=settings.HEALTH_CHECK_INTERVAL,
+        timeout=settings.HEALTH_CHECK_TIMEOUT,
+        stale_after=settings.HEALTH_STALE_AFTER,
+        saturation_threshold=settings.HEALTH_POOL_SATURATION_THRESHOLD,
+    )
@@ -0,0 +1,313 @@
+"""Execução de jobs em segundo plano com armazenamento local de arquivos."""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# IDs são gerados com uuid4().hex; qualquer outro valor é rejeitado antes de
+# virar caminho no disco
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _agora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _processo_ativo(pid: Optional[int]) -> bool:
+    """Indica se o processo que criou um job ainda existe (e não é o atual)."""
+    if not pid or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    Armazena entrada, resultado e estado dos jobs em um diretório local.
+
+    Cada job ocupa um subdiretório com os arquivos de entrada e resultado e um
+    status.json, regravado de forma atômica a cada atualização de progresso.
+    O estado registra o PID do processo que criou o job, que é quem o executa.
+    """
+
+    INPUT_FILE = "entrada.csv"
+    RESULT_FILE = "resultado.csv"
+    STATUS_FILE = "status.json"
+
+    def __init__(self, root: str):
+        """Inicializa o armazenamento no diretório informado."""
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, job_id: str, name: str) -> str:
+        return os.path.join(self.root, job_id, name)
+
+    def create(self) -> str:
+        """
+        Cria o diretório e o estado inicial de um novo job.
+
+        Returns:
+            ID do job criado
+        """
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.root, job_id))
+        self._write_status(
+            job_id,
+            {
+                "id": job_id,
+                "status": JOB_QUEUED,
+                "total": 0,
+                "processed": 0,
+                "matched": 0,
+                "invalid": 0,
+                "created_at": _agora(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "pid": os.getpid(),
+            },
+        )
+        return job_id
+
+    def delete(self, job_id: str) -> None:
+        """Remove o job e seus arquivos."""
+        shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
+
+    def job_ids(self) -> List[str]:
+        """Lista os IDs dos jobs armazenados."""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return [name for name in names if _JOB_ID_PATTERN.match(name)]
+
+    def fail_orphans(self) -> int:
+        """
+        Marca como falhos os jobs pendentes cujo processo não existe mais.
+
+        Jobs enfileirados ou em execução quando o processo foi encerrado nunca
+        terminariam. Deve ser chamado na inicialização, antes de o processo
+        criar jobs: jobs com o PID do próprio processo vêm de uma execução
+        anterior que reutilizou o mesmo PID.
+
+        Returns:
+            Número de jobs marcados como falhos
+        """
+        failed = 0
+        for job_id in self.job_ids():
+            status = self.read_status(job_id)
+            if status is None or status["status"] not in (JOB_QUEUED, JOB_RUNNING):
+                continue
+            if _processo_ativo(status.get("pid")):
+                continue
+            self.update_status(
+                job_id,
+                status=JOB_FAILED,
+                finished_at=_agora(),
+                error="Job interrompido pelo encerramento do servidor",
+            )
+            failed += 1
+        return failed
+
+    def cleanup(self, retention_seconds: float) -> int:
+        """
+        Remove os jobs concluídos ou com falha há mais de retention_seconds.
+
+        Diretórios sem estado (criação interrompida) são removidos pela data de
+        modificação. Jobs enfileirados ou em execução nunca são removidos.
+
+        Args:
+            retention_seconds: Tempo de retenção após o fim do job
+
+        Returns:
+            Número de jobs removidos
+        """
+        limite = time.time() - retention_seconds
+        removed = 0
+        for job_id in self.job_ids():
+            status = self.read_status(job_id)
+            if status is None:
+                try:
+                    finished = os.path.getmtime(os.path.join(self.root, job_id))
+                except FileNotFoundError:
+                    continue
+            elif status["status"] in (JOB_COMPLETED, JOB_FAILED) and status.get(
+                "finished_at"
+            ):
+                finished = datetime.fromisoformat(status["finished_at"]).timestamp()
+            else:
+                continue
+
+            if finished < limite:
+                self.delete(job_id)
+                removed += 1
+        return removed
+
+    def input_path(self, job_id: str) -> str:
+        return self._path(job_id, self.INPUT_FILE)
+
+    def result_path(self, job_id: str) -> str:
+        return self._path(job_id, self.RESULT_FILE)
+
+    def read_status(self, job_id: str) -> Optional[dict]:
+        """
+        Lê o estado de um job.
+
+        Args:
+            job_id: ID do job
+
+        Returns:
+            Dicionário de estado, ou None se o job não existir
+        """
+        if not _JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id, self.STATUS_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def update_status(self, job_id: str, **fields) -> dict:
+        """
+        Atualiza campos do estado de um job.
+
+        Args:
+            job_id: ID do job
+            fields: Campos a atualizar
+
+        Returns:
+            Estado atualizado
+        """
+        with self._lock:
+            status = self.read_status(job_id) or {"id": job_id}
+            status.update(fields)
+            self._write_status(job_id, status)
+        return status
+
+    def _write_status(self, job_id: str, status: dict) -> None:
+        path = self._path(job_id, self.STATUS_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(status, f)
+        os.replace(tmp_path, path)
+
+
+class JobManager:
+    """
+    Pool de workers que executa os jobs enfileirados.
+
+    Uma thread de manutenção remove periodicamente os jobs que passaram do
+    tempo de retenção.
+    """
+
+    def __init__(self, store: JobStore, workers: int):
+        """Inicializa o pool com o número de workers informado."""
+        self.store = store
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="job-worker"
+        )
+        self._stop = threading.Event()
+        self._cleaner: Optional[threading.Thread] = None
+
+    def start(self, retention_seconds: float, interval: float) -> None:
+        """
+        Recupera os jobs órfãos e inicia a limpeza periódica.
+
+        Args:
+            retention_seconds: Tempo de retenção dos jobs concluídos ou com falha
+            interval: Intervalo entre limpezas, em segundos
+        """
+        failed = self.store.fail_orphans()
+        if failed:
+            logger.warning(f"{failed} jobs interrompidos marcados como falhos")
+        self._cleanup(retention_seconds)
+
+        self._cleaner = threading.Thread(
+            target=self._cleanup_loop,
+            args=(retention_seconds, interval),
+            name="job-cleanup",
+            daemon=True,
+        )
+        self._cleaner.start()
+
+    def _cleanup_loop(self, retention_seconds: float, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self._cleanup(retention_seconds)
+
+    def _cleanup(self, retention_seconds: float) -> None:
+        try:
+            removed = self.store.cleanup(retention_seconds)
+        except Exception as e:
+            logger.error(f"Erro ao remover jobs antigos: {str(e)}")
+            return
+        if removed:
+            logger.info(f"{removed} jobs antigos removidos")
+
+    def submit(self, job_id: str, fn: Callable[[str, Callable[..., None]], dict]) -> None:
+        """
+        Enfileira a execução de um job.
+
+        Args:
+            job_id: ID do job
+            fn: Função que processa o job; recebe o ID e uma função de
+                progresso (campos do estado como keyword arguments) e retorna
+                os campos finais do estado
+        """
+        self._executor.submit(self._run, job_id, fn)
+
+    def _run(self, job_id: str, fn: Callable[[str, Callable[..., None]], dict]) -> None:
+        logger.info(f"Iniciando job {job_id}")
+        self.store.update_status(job_id, status=JOB_RUNNING, started_at=_agora())
+
+        def progress(**fields) -> None:
+            self.store.update_status(job_id, **fields)
+
+        try:
+            summary = fn(job_id, progress)
+        except Exception as e:
+            logger.error(f"Erro ao processar job {job_id}: {str(e)}")
+            self.store.update_status(
+                job_id, status=JOB_FAILED, finished_at=_agora(), error=str(e)
+            )
+            return
+
+        self.store.update_status(
+            job_id, status=JOB_COMPLETED, finished_at=_agora(), **summary
+        )
+        logger.info(f"Job {job_id} concluído: {summary}")
+
+    def shutdown(self) -> None:
+        """Encerra o pool e a limpeza, descartando jobs que ainda não começaram."""
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_job_manager() -> JobManager:
+    """Get cached job manager backed by the local job store."""
+    settings = get_settings()
+    return JobManager(JobStore(settings.JOBS_DIR), workers=settings.JOBS_WORKERS)
@@ -0,0 +1,90 @@
+"""Coalescência de chamadas idênticas concorrentes (single-flight)."""
+
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Executa uma única vez chamadas concorrentes com a mesma chave.
+
+    A primeira chamada (líder) executa a função; as chamadas que chegam enquanto
+    ela está em andamento aguardam e recebem o mesmo resultado ou exceção.
+    """
+
+    def __init__(self):
+        """Inicializa o registro de chamadas em andamento e os contadores."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        retry_on: Optional[Callable[[BaseException], bool]] = None,
+    ) -> Any:
+        """
+        Executa a função ou aguarda a execução em andamento com a mesma chave.
+
+        Args:
+            key: Chave normalizada que identifica chamadas equivalentes
+            fn: Função sem argumentos que produz o resultado
+            retry_on: Predicado que indica se uma exceção do líder deve fazer
+                a chamada aguardando executar a função por conta própria
+
+        Returns:
+            Resultado da função, possivelmente compartilhado com outras chamadas
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            try:
+                return future.result()
+            except BaseException as e:
+                if retry_on is not None and retry_on(e):
+                    return fn()
+                raise
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores de execução e coalescência.
+
+        Returns:
+            Dicionário com execuções, chamadas coalescidas e chamadas em andamento
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+@lru_cache()
+def get_single_flight() -> SingleFlight:
+    """Get cached single-flight instance shared by the repositories."""
+    return SingleFlight()
@@ -0,0 +1,130 @@
+"""Aquecimento da aplicação na inicialização: módulos, pool, instruções e caches."""
+
+import importlib
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Índices GIST das tabelas de fazendas (inclusive partições e partes subdivididas);
+# relkind 'i' exclui os índices particionados, que não têm armazenamento próprio
+GIST_INDEXES_SQL = """
+SELECT c.relname
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_class t ON t.oid = i.indrelid
+JOIN pg_am am ON am.oid = c.relam
+WHERE am.amname = 'gist' AND c.relkind = 'i' AND t.relname LIKE 'area_imovel_1%'
+"""
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def _prepare_rounds(connection: Connection) -> int:
+    """
+    Número de execuções para que o driver prepare uma instrução no servidor.
+
+    O psycopg 3 prepara automaticamente a instrução na execução seguinte às
+    prepare_threshold execuções na mesma conexão (None desativa). Drivers sem
+    essa configuração (sqlite3, no backend SpatiaLite) não preparam
+    instruções, e uma execução basta para aquecer os caches.
+    """
+    threshold = getattr(connection.connection.driver_connection, "prepare_threshold", None)
+    return 1 if threshold is None else threshold + 1
+
+
+def _prewarm(engine: Engine) -> list[str]:
+    """Carrega os índices GIST no shared_buffers com pg_prewarm."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        indexes = conn.execute(text(GIST_INDEXES_SQL)).scalars().all()
+        for index in indexes:
+            conn.execute(text("SELECT pg_prewarm(CAST(:index AS regclass))"), {"index": index})
+    return indexes
+
+
+def warm_up(
+    engine: Engine,
+    connections: int,
+    prepare: Optional[Callable[[Session], None]] = None,
+    preload: Iterable[str] = (),
+    prewarm: bool = False,
+) -> dict:
+    """
+    Aquece a aplicação antes de receber tráfego.
+
+    Importa módulos carregados sob demanda, abre as conexões do pool, executa em
+    cada uma as instruções representativas do repositório e, opcionalmente,
+    carrega os índices GIST com pg_prewarm.
+
+    As instruções são repetidas em cada conexão até o driver prepará-las no
+    servidor (prepare_threshold do psycopg 3), além de preencherem o cache de
+    compilação do SQLAlchemy e os caches de catálogo do backend. A transação é
+    encerrada com COMMIT, pois o rollback do psycopg 3 descarta as instruções
+    preparadas da conexão.
+
+    Falhas no banco são registradas e não impedem a inicialização; o health
+    check continua responsável por indicar a indisponibilidade.
+
+    Args:
+        engine: Engine cujo pool será aquecido
+        connections: Número de conexões a abrir (normalmente DB_POOL_SIZE)
+        prepare: Função que executa as instruções representativas em uma sessão
+        preload: Módulos a importar antecipadamente
+        prewarm: Se True, executa pg_prewarm nos índices GIST (PostgreSQL)
+
+    Returns:
+        Relatório com a duração de cada etapa em milissegundos
+    """
+    report = {}
+
+    start = time.perf_counter()
+    for module in preload:
+        importlib.import_module(module)
+    report["preload_ms"] = _elapsed_ms(start)
+
+    start = time.perf_counter()
+    opened = []
+    try:
+        # Mantém todas abertas ao mesmo tempo para que o pool crie conexões distintas
+        for _ in range(connections):
+            opened.append(engine.connect())
+        report["connections"] = len(opened)
+        report["connect_ms"] = _elapsed_ms(start)
+
+        if prepare is not None:
+            start = time.perf_counter()
+            for connection in opened:
+                rounds = _prepare_rounds(connection)
+                with Session(bind=connection) as db:
+                    for _ in range(rounds):
+                        prepare(db)
+                    db.commit()
+            report["prepare_rounds"] = rounds
+            report["prepare_ms"] = _elapsed_ms(start)
+    except SQLAlchemyError as e:
+        logger.warning(f"Falha ao aquecer o pool de conexões: {str(e)}")
+        report["error"] = str(e)
+    finally:
+        # Devolve as conexões ao pool, já estabelecidas
+        for connection in opened:
+            connection.close()
+
+    if prewarm and engine.dialect.name == "postgresql" and "error" not in report:
+        start = time.perf_counter()
+        try:
+            report["prewarmed"] = _prewarm(engine)
+            report["prewarm_ms"] = _elapsed_ms(start)
+        except SQLAlchemyError as e:
+            logger.warning(
+                f"pg_prewarm indisponível (a extensão precisa estar instalada): {str(e)}"
+            )
+
+    return report
@@ -0,0 +1,98 @@
+"""Bounding boxes aproximados dos estados brasileiros, usados para poda de partições."""
+
+import math
+from typing import List
+
+# (min_longitude, min_latitude, max_longitude, max_latitude) de cada UF,
+# arredondados para fora; a margem abaixo cobre imprecisões nas divisas
+ESTADOS_BBOX = {
+    "AC": (-74.0, -11.2, -66.6, -7.1),
+    "AL": (-38.3, -10.5, -35.1, -8.8),
+    "AM": (-73.8, -9.9, -56.1, 2.3),
+    "AP": (-54.9, -1.3, -49.8, 4.5),
+    "BA": (-46.7, -18.4, -37.3, -8.5),
+    "CE": (-41.5, -7.9, -37.2, -2.7),
+    "DF": (-48.3, -16.1, -47.3, -15.5),
+    "ES": (-41.9, -21.3, -28.8, -17.8),  # inclui Trindade e Martim Vaz
+    "GO": (-53.3, -19.5, -45.9, -12.4),
+    "MA": (-48.8, -10.3, -41.8, -1.0),
+    "MG": (-51.1, -23.0, -39.8, -14.2),
+    "MS": (-58.2, -24.1, -50.9, -17.1),
+    "MT": (-61.7, -18.1, -50.2, -7.3),
+    "PA": (-58.9, -9.9, -46.0, 2.6),
+    "PB": (-38.8, -8.3, -34.7, -6.0),
+    "PE": (-41.4, -9.5, -32.3, -3.8),  # inclui Fernando de Noronha
+    "PI": (-46.0, -11.0, -40.3, -2.7),
+    "PR": (-54.7, -26.8, -48.0, -22.5),
+    "RJ": (-44.9, -23.4, -40.9, -20.7),
+    "RN": (-38.6, -7.0, -32.3, -4.8),  # inclui Atol das Rocas
+    "RO": (-66.9, -13.7, -59.7, -7.9),
+    "RR": (-64.9, -1.6, -58.8, 5.3),
+    "RS": (-57.7, -33.8, -49.6, -27.0),
+    "SC": (-53.9, -29.4, -48.3, -25.9),
+    "SE": (-38.3, -11.6, -36.3, -9.5),
+    "SP": (-53.2, -25.4, -44.1, -19.7),
+    "TO": (-50.8, -13.5, -45.7, -5.1),
+}
+
+# Margem em graus aplicada a cada bounding box
+MARGEM_GRAUS = 0.25
+
+# Quilômetros por grau de latitude
+KM_POR_GRAU = 110.574
+
+
+def estados_no_bbox(
+    min_longitude: float,
+    min_latitude: float,
+    max_longitude: float,
+    max_latitude: float,
+) -> List[str]:
+    """
+    Retorna as UFs cujo bounding box intersecta o bounding box informado.
+
+    Args:
+        min_longitude: Longitude mínima
+        min_latitude: Latitude mínima
+        max_longitude: Longitude máxima
+        max_latitude: Latitude máxima
+
+    Returns:
+        Lista de siglas das UFs, vazia se o bbox estiver fora do Brasil
+    """
+    return [
+        uf
+        for uf, (uf_min_lon, uf_min_lat, uf_max_lon, uf_max_lat) in ESTADOS_BBOX.items()
+        if min_longitude <= uf_max_lon + MARGEM_GRAUS
+        and max_longitude >= uf_min_lon - MARGEM_GRAUS
+        and min_latitude <= uf_max_lat + MARGEM_GRAUS
+        and max_latitude >= uf_min_lat - MARGEM_GRAUS
+    ]
+
+
+def bbox_do_raio(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """
+    Calcula um bounding box que contém o círculo de raio informado.
+
+    Args:
+        latitude: Latitude do centro
+        longitude: Longitude do centro
+        radius_km: Raio em quilômetros
+
+    Returns:
+        Tupla (min_longitude, min_latitude, max_longitude, max_latitude)
+    """
+    # Margem de 1% para compensar a aproximação esférica
+    lat_delta = radius_km * 1.01 / KM_POR_GRAU
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_delta, 90.0)))
+    # Junto ao polo o círculo cobre todas as longitudes, qualquer que seja o centro
+    lon_delta = 360.0 if cos_lat < 1e-6 else lat_delta / cos_lat
+
+    return (
+        max(longitude - lon_delta, -180.0),
+        max(latitude - lat_delta, -90.0),
+        min(longitude + lon_delta, 180.0),
+        min(latitude + lat_delta, 90.0),
+    )
@@ -1,7 +1,11 @@
 from geoalchemy2 import Geometry
-from sqlalchemy import Column, Index, Integer, String
+from sqlalchemy import DDL, BigInteger, Column, Index, Integer, String, event
 
+from app.core.config import get_settings
 from app.core.database import Base
+from app.fazendas.estados import ESTADOS_BBOX
+
+settings = get_settings()
 
 
 class AreaImovel(Base):
@@ -19,17 +23,196 @@ class AreaImovel(Base):
     ind_tipo = Column(String(254))
     des_condic = Column(String(254))
     municipio = Column(String(254), index=True)
-    cod_estado = Column(String(254), index=True)
+    # Quando particionada, a chave de partição precisa fazer parte da chave primária
+    cod_estado = Column(
+        String(254), index=True, primary_key=settings.DB_PARTITION_BY_ESTADO
+    )
     dat_criaca = Column(String(254))
     dat_atuali = Column(String(254))
     geom = Column(Geometry("MULTIPOLYGON", srid=4326))
 
     __table_args__ = (
         # Spatial index for geometry column (PostGIS will create this automatically)
-        Index("idx_area_imovel_geom", "geom", postgresql_using="gist"),
+        Index("idx_area_imovel_geom", "geom", postgresql_using="gist").ddl_if(
+            dialect="postgresql"
+        ),
         # Composite index for common queries
         Index("idx_municipio_estado", "municipio", "cod_estado"),
+        # Indexes declared on the partitioned table are created on every partition
+        (
+            {"postgresql_partition_by": "LIST (cod_estado)"}
+            if settings.DB_PARTITION_BY_ESTADO
+            else {}
+        ),
     )
 
     def __repr__(self):
         return f"<AreaImovel(gid={self.gid}, cod_imovel='{self.cod_imovel}', municipio='{self.municipio}')>"
+
+
+class AreaImovelSubdividida(Base):
+    """Model for farm geometry pieces (ST_Subdivide) used to speed up spatial predicates."""
+
+    __tablename__ = "area_imovel_1_subdividida"
+
+    id = Column(Integer, primary_key=True)
+    gid = Column(Integer, nullable=False, index=True)
+    geom = Column(Geometry("GEOMETRY", srid=4326, spatial_index=False))
+
+    __table_args__ = (
+        Index(
+            "idx_area_imovel_subdividida_geom", "geom", postgresql_using="gist"
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    def __repr__(self):
+        return f"<AreaImovelSubdividida(id={self.id}, gid={self.gid})>"
+
+
+class AreaImovelVersao(Base):
+    """Single-row table holding the version counter of area_imovel_1."""
+
+    __tablename__ = "area_imovel_versao"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    versao = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AreaImovelVersao(versao={self.versao})>"
+
+
+# Cria uma partição por UF e uma partição padrão para códigos desconhecidos
+PARTICOES_ESTADO_DDL = "\n".join(
+    [
+        f"CREATE TABLE IF NOT EXISTS area_imovel_1_{uf.lower()} "
+        f"PARTITION OF area_imovel_1 FOR VALUES IN ('{uf}');"
+        for uf in ESTADOS_BBOX
+    ]
+    + ["CREATE TABLE IF NOT EXISTS area_imovel_1_default PARTITION OF area_imovel_1 DEFAULT;"]
+)
+
+if settings.DB_PARTITION_BY_ESTADO:
+    event.listen(
+        AreaImovel.__table__,
+        "after_create",
+        DDL(PARTICOES_ESTADO_DDL).execute_if(dialect="postgresql"),
+    )
+
+
+# Mantém as geometrias subdivididas sincronizadas com area_imovel_1
+SUBDIVISAO_TRIGGER_DDL = f"""
+CREATE OR REPLACE FUNCTION area_imovel_1_subdividir() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM area_imovel_1_subdividida WHERE gid = OLD.gid;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.geom IS NOT NULL THEN
+        INSERT INTO area_imovel_1_subdividida (gid, geom)
+        SELECT NEW.gid, ST_Subdivide(NEW.geom, {settings.SUBDIVIDE_MAX_VERTICES});
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_area_imovel_1_subdividir ON area_imovel_1;
+
+CREATE TRIGGER trg_area_imovel_1_subdividir
+AFTER INSERT OR DELETE OR UPDATE OF gid, geom ON area_imovel_1
+FOR EACH ROW EXECUTE FUNCTION area_imovel_1_subdividir();
+"""
+
+# Popula a tabela subdividida com as fazendas já existentes
+SUBDIVISAO_BACKFILL_DDL = f"""
+INSERT INTO area_imovel_1_subdividida (gid, geom)
+SELECT gid, ST_Subdivide(geom, {settings.SUBDIVIDE_MAX_VERTICES})
+FROM area_imovel_1
+WHERE geom IS NOT NULL;
+"""
+
+event.listen(
+    AreaImovelSubdividida.__table__,
+    "after_create",
+    DDL(SUBDIVISAO_TRIGGER_DDL).execute_if(dialect="postgresql"),
+)
+event.listen(
+    AreaImovelSubdividida.__table__,
+    "after_create",
+    DDL(SUBDIVISAO_BACKFILL_DDL).execute_if(dialect="postgresql"),
+)
+
+
+# Incrementa a versão da tabela a cada comando que altera area_imovel_1 (inclusive
+# COPY e upserts da ingestão), invalidando os ETags das buscas
+VERSAO_INICIAL_DDL = "INSERT INTO area_imovel_versao (id, versao) VALUES (1, 0)"
+
+VERSAO_TRIGGER_DDL = """
+CREATE OR REPLACE FUNCTION area_imovel_1_versionar() RETURNS trigger AS $$
+BEGIN
+    UPDATE area_imovel_versao SET versao = versao + 1 WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_area_imovel_1_versionar ON area_imovel_1;
+
+CREATE TRIGGER trg_area_imovel_1_versionar
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON area_imovel_1
+FOR EACH STATEMENT EXECUTE FUNCTION area_imovel_1_versionar();
+"""
+
+# SQLite só tem triggers por linha e executa um comando por vez
+VERSAO_TRIGGERS_SQLITE_DDL = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_area_imovel_1_versionar_{operacao.lower()} "
+    f"AFTER {operacao} ON area_imovel_1 "
+    "BEGIN UPDATE area_imovel_versao SET versao = versao + 1 WHERE id = 1; END"
+    for operacao in ("INSERT", "UPDATE", "DELETE")
+]
+
+event.listen(AreaImovelVersao.__table__, "after_create", DDL(VERSAO_INICIAL_DDL))
+event.listen(
+    AreaImovelVersao.__table__,
+    "after_create",
+    DDL(VERSAO_TRIGGER_DDL).execute_if(dialect="postgresql"),
+)
+for _ddl in VERSAO_TRIGGERS_SQLITE_DDL:
+    event.listen(
+        AreaImovelVersao.__table__,
+        "after_create",
+        DDL(_ddl).execute_if(dialect="sqlite"),
+    )
+
+
+# Converte num_area (texto) em numérico, ignorando valores mal formatados
+AREA_NUMERICA_SQL = r"CASE WHEN num_area ~ '^-?[0-9]+(\.[0-9]+)?$' THEN num_area::numeric END"
+
+# Views materializadas de estatísticas agregadas, atualizadas após cada ingestão
+ESTATISTICAS_VIEWS = {
+    "mv_estatisticas_estado": ["cod_estado"],
+    "mv_estatisticas_municipio": ["cod_estado", "municipio"],
+    "mv_estatisticas_status": ["cod_estado", "ind_status"],
+}
+
+
+def estatisticas_view_ddl(view: str, columns: list[str]) -> str:
+    keys = ", ".join(f"COALESCE({column}, '') AS {column}" for column in columns)
+    group_by = ", ".join(str(i + 1) for i in range(len(columns)))
+    return f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {view} AS
+SELECT
+    {keys},
+    count(*) AS total_fazendas,
+    sum({AREA_NUMERICA_SQL}) AS area_total,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY {AREA_NUMERICA_SQL}) AS area_mediana
+FROM area_imovel_1
+GROUP BY {group_by};
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_{view} ON {view} ({", ".join(columns)});
+"""
+
+
+for _view, _columns in ESTATISTICAS_VIEWS.items():
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(estatisticas_view_ddl(_view, _columns)).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,113 @@
+"""Repositório de Fazenda com coalescência de consultas idênticas concorrentes."""
+
+import logging
+from functools import partial
+from typing import List
+
+from app.core.config import get_settings
+from app.core.database import is_query_cancelled
+from app.core.singleflight import get_single_flight
+from app.fazendas.models_sqla import AreaImovel
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Casas decimais usadas para normalizar coordenadas (~1 cm)
+COORDINATE_PRECISION = 7
+
+
+class CoalescingFazendaRepository(FazendaRepository):
+    """
+    Repositório que compartilha uma única execução entre consultas idênticas em andamento.
+
+    As instâncias de AreaImovel do resultado compartilhado são desanexadas da
+    sessão do líder (expunge) assim que carregadas; com todas as colunas já
+    carregadas, as demais requisições as leem sem acessar uma sessão que não
+    lhes pertence. Devem ser tratadas como somente leitura.
+
+    Como a sessão de get_db só obtém uma conexão na primeira consulta, as
+    requisições que aguardam o líder também não ocupam conexões do pool.
+    """
+
+    def _detach(self, result):
+        """Desanexa da sessão as fazendas de um resultado (lista ou (lista, total))."""
+        fazendas = result[0] if isinstance(result, tuple) else result
+        for fazenda in fazendas:
+            if isinstance(fazenda, AreaImovel):
+                self.db.expunge(fazenda)
+        return result
+
+    def _coalesce(self, key: tuple, fn):
+        if not settings.QUERY_COALESCING_ENABLED:
+            return fn()
+
+        # Se a consulta do líder foi cancelada (desconexão do cliente ou prazo
+        # do líder), a requisição que aguardava executa a própria consulta
+        return get_single_flight().do(
+            key, lambda: self._detach(fn()), retry_on=is_query_cancelled
+        )
+
+    def find_by_point(self, latitude: float, longitude: float) -> List[AreaImovel]:
+        key = (
+            "find_by_point",
+            round(latitude, COORDINATE_PRECISION),
+            round(longitude, COORDINATE_PRECISION),
+        )
+        return self._coalesce(key, partial(super().find_by_point, latitude, longitude))
+
+    def find_by_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        offset: int,
+        limit: int,
+    ) -> tuple[List[AreaImovel], int]:
+        key = (
+            "find_by_radius",
+            round(latitude, COORDINATE_PRECISION),
+            round(longitude, COORDINATE_PRECISION),
+            round(radius_km, 6),
+            offset,
+            limit,
+        )
+        return self._coalesce(
+            key,
+            partial(super().find_by_radius, latitude, longitude, radius_km, offset, limit),
+        )
+
+    def find_by_area(
+        self, area_wkt: str, offset: int, limit: int
+    ) -> tuple[List[AreaImovel], int]:
+        key = ("find_by_area", area_wkt, offset, limit)
+        return self._coalesce(key, partial(super().find_by_area, area_wkt, offset, limit))
+
+    def cluster_centroids(
+        self,
+        min_longitude: float,
+        min_latitude: float,
+        max_longitude: float,
+        max_latitude: float,
+        cell_size: float,
+    ) -> List[dict]:
+        key = (
+            "cluster_centroids",
+            min_longitude,
+            min_latitude,
+            max_longitude,
+            max_latitude,
+            cell_size,
+        )
+        return self._coalesce(
+            key,
+            partial(
+                super().cluster_centroids,
+                min_longitude,
+                min_latitude,
+                max_longitude,
+                max_latitude,
+                cell_size,
+            ),
+        )
@@ -0,0 +1,111 @@
+"""Camada de repositório para estatísticas agregadas de Fazenda."""
+
+import logging
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.fazendas.models_sqla import ESTATISTICAS_VIEWS
+
+logger = logging.getLogger(__name__)
+
+
+class EstatisticasRepository:
+    """Repositório para consultas às views materializadas de estatísticas."""
+
+    def __init__(self, db: Session):
+        """Inicializa o repositório com a sessão do banco de dados."""
+        self.db = db
+
+    def _query_view(self, view: str, cod_estado: Optional[str] = None) -> List[dict]:
+        columns = ESTATISTICAS_VIEWS[view]
+        query = (
+            f"SELECT {', '.join(columns)}, total_fazendas, area_total, area_mediana "
+            f"FROM {view}"
+        )
+        params = {}
+
+        if cod_estado is not None:
+            query += " WHERE cod_estado = :cod_estado"
+            params["cod_estado"] = cod_estado
+
+        query += f" ORDER BY {', '.join(columns)}"
+
+        rows = self.db.execute(text(query), params).mappings().all()
+        return [dict(row) for row in rows]
+
+    def by_estado(self) -> List[dict]:
+        """
+        Retorna estatísticas agregadas por estado.
+
+        Returns:
+            Lista de dicionários com contagem, área total e mediana por estado
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            logger.debug("Consultando estatísticas por estado")
+            return self._query_view("mv_estatisticas_estado")
+        except SQLAlchemyError as e:
+            logger.error(f"Erro no banco de dados ao buscar estatísticas por estado: {str(e)}")
+            raise
+
+    def by_municipio(self, cod_estado: Optional[str] = None) -> List[dict]:
+        """
+        Retorna estatísticas agregadas por município.
+
+        Args:
+            cod_estado: Filtra os municípios de um estado, se informado
+
+        Returns:
+            Lista de dicionários com contagem, área total e mediana por município
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            logger.debug(f"Consultando estatísticas por município (estado={cod_estado})")
+            return self._query_view("mv_estatisticas_municipio", cod_estado)
+        except SQLAlchemyError as e:
+            logger.error(f"Erro no banco de dados ao buscar estatísticas por município: {str(e)}")
+            raise
+
+    def by_status(self, cod_estado: Optional[str] = None) -> List[dict]:
+        """
+        Retorna estatísticas agregadas por status do imóvel em cada estado.
+
+        Args:
+            cod_estado: Filtra por estado, se informado
+
+        Returns:
+            Lista de dicionários com contagem, área total e mediana por status
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            logger.debug(f"Consultando estatísticas por status (estado={cod_estado})")
+            return self._query_view("mv_estatisticas_status", cod_estado)
+        except SQLAlchemyError as e:
+            logger.error(f"Erro no banco de dados ao buscar estatísticas por status: {str(e)}")
+            raise
+
+    def refresh(self) -> None:
+        """
+        Atualiza as views materializadas sem bloquear leituras concorrentes.
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            for view in ESTATISTICAS_VIEWS:
+                logger.debug(f"Atualizando view materializada {view}")
+                self.db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Erro no banco de dados ao atualizar estatísticas: {str(e)}")
+            raise
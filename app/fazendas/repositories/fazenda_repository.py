@@ -1,17 +1,48 @@
 """Camada de repositório para operações de banco de dados de Fazenda."""
 
 import logging
-from typing import List, Optional
+import threading
+import time
+from typing import Iterator, List, Optional
 
 from geoalchemy2 import Geography
-from sqlalchemy import cast, func
+from shapely import wkt
+from shapely.geometry import box
+from sqlalchemy import (
+    Float,
+    Integer,
+    cast,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    values,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.fazendas.models_sqla import AreaImovel
+from app.core.config import get_settings
+from app.fazendas.estados import ESTADOS_BBOX, bbox_do_raio, estados_no_bbox
+from app.fazendas.models_sqla import (
+    AREA_NUMERICA_SQL,
+    AreaImovel,
+    AreaImovelSubdividida,
+    AreaImovelVersao,
+)
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+# Colunas exportadas, na ordem do schema Arrow
+EXPORT_COLUMNS = [column.name for column in AreaImovel.__table__.columns]
+
+# Versão da tabela em cache no processo: (versão, instante de expiração)
+_versao_cache = (None, 0.0)
+_versao_lock = threading.Lock()
+
 
 class FazendaRepository:
     """Repositório para operações de banco de dados de Fazenda."""
@@ -20,6 +51,122 @@ class FazendaRepository:
         """Inicializa o repositório com a sessão do banco de dados."""
         self.db = db
 
+    @staticmethod
+    def _filtro_estados(
+        min_longitude: float,
+        min_latitude: float,
+        max_longitude: float,
+        max_latitude: float,
+    ) -> list:
+        """
+        Monta o predicado de estado que permite a poda de partições.
+
+        Com a tabela particionada por cod_estado, restringe a consulta às UFs cujo
+        bounding box intersecta a área consultada, além da partição padrão.
+
+        Returns:
+            Lista de critérios para filter(), vazia se a tabela não for particionada
+        """
+        if not settings.DB_PARTITION_BY_ESTADO:
+            return []
+
+        estados = estados_no_bbox(min_longitude, min_latitude, max_longitude, max_latitude)
+        logger.debug(f"Restringindo consulta às partições dos estados: {estados}")
+        # Registros com UF desconhecida ou nula (partição padrão) nunca são descartados
+        return [
+            or_(
+                AreaImovel.cod_estado.in_(estados),
+                AreaImovel.cod_estado.notin_(list(ESTADOS_BBOX)),
+                AreaImovel.cod_estado.is_(None),
+            )
+        ]
+
+    @staticmethod
+    def _candidatos_spatialite(frame_wkt: str):
+        """
+        Monta o pré-filtro pelo índice espacial (R*Tree) do SpatiaLite.
+
+        Args:
+            frame_wkt: Geometria em WKT cujo bounding box delimita os candidatos
+
+        Returns:
+            Subconsulta com os GIDs cujos bounding boxes intersectam o da geometria
+        """
+        return (
+            text(
+                "SELECT rowid FROM SpatialIndex "
+                "WHERE f_table_name = 'area_imovel_1' AND f_geometry_column = 'geom' "
+                "AND search_frame = ST_GeomFromText(:frame, 4326)"
+            )
+            .bindparams(frame=frame_wkt)
+            .columns(rowid=Integer)
+        )
+
+    def _criterios_raio(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> list:
+        """
+        Monta os critérios da busca por raio.
+
+        Args:
+            latitude: Latitude do ponto central
+            longitude: Longitude do ponto central
+            radius_km: Raio de busca em quilômetros
+
+        Returns:
+            Lista de critérios para filter()
+        """
+        point = func.ST_GeomFromText(f"POINT({longitude} {latitude})", 4326)
+        radius_meters = radius_km * 1000
+        bbox = bbox_do_raio(latitude, longitude, radius_km)
+
+        if settings.is_spatialite:
+            # PtDistWithin mede em metros sobre o elipsoide para SRID 4326
+            return [
+                AreaImovel.gid.in_(self._candidatos_spatialite(box(*bbox).wkt)),
+                func.PtDistWithin(AreaImovel.geom, point, radius_meters),
+            ]
+
+        return [
+            func.ST_DWithin(
+                cast(AreaImovel.geom, Geography),
+                cast(point, Geography),
+                radius_meters,
+            ),
+            *self._filtro_estados(*bbox),
+        ]
+
+    def _criterios_area(self, area_wkt: str) -> list:
+        """
+        Monta os critérios da busca por área.
+
+        Args:
+            area_wkt: Geometria da área em WKT (SRID 4326)
+
+        Returns:
+            Lista de critérios para filter()
+        """
+        area = func.ST_GeomFromText(area_wkt, 4326)
+
+        if settings.is_spatialite:
+            return [
+                AreaImovel.gid.in_(self._candidatos_spatialite(area_wkt)),
+                func.ST_Intersects(AreaImovel.geom, area),
+            ]
+
+        # Pré-filtro por bounding box (&&) usa o índice GIST das partes
+        # subdivididas antes do teste exato de interseção
+        gids = select(AreaImovelSubdividida.gid).where(
+            AreaImovelSubdividida.geom.op("&&")(func.ST_Envelope(area)),
+            func.ST_Intersects(AreaImovelSubdividida.geom, area),
+        )
+        filtro_estados = (
+            self._filtro_estados(*wkt.loads(area_wkt).bounds)
+            if settings.DB_PARTITION_BY_ESTADO
+            else []
+        )
+        return [AreaImovel.gid.in_(gids), *filtro_estados]
+
     def get_by_id(self, gid: int) -> Optional[AreaImovel]:
         """
         Busca uma fazenda pelo seu GID.
@@ -40,6 +187,94 @@ class FazendaRepository:
             logger.error(f"Erro no banco de dados ao buscar fazenda {gid}: {str(e)}")
             raise
 
+    def get_revisao(self, gid: int) -> Optional[tuple]:
+        """
+        Busca apenas o gid e a data de atualização de uma fazenda.
+
+        Usado na validação de ETags, sem carregar a geometria.
+
+        Args:
+            gid: ID da fazenda
+
+        Returns:
+            Tupla (gid, dat_atuali) se encontrada, None caso contrário
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            return (
+                self.db.query(AreaImovel.gid, AreaImovel.dat_atuali)
+                .filter(AreaImovel.gid == gid)
+                .first()
+            )
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Erro no banco de dados ao buscar revisão da fazenda {gid}: {str(e)}"
+            )
+            raise
+
+    def get_version(self) -> int:
+        """
+        Retorna a versão de area_imovel_1, incrementada a cada alteração da tabela.
+
+        O valor fica em cache no processo por ETAG_VERSION_TTL segundos, de modo que
+        requisições condicionais repetidas não consultam o banco.
+
+        Returns:
+            Versão atual da tabela
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        global _versao_cache
+
+        now = time.monotonic()
+        with _versao_lock:
+            versao, expira = _versao_cache
+        if versao is not None and now < expira:
+            return versao
+
+        try:
+            versao = (
+                self.db.query(AreaImovelVersao.versao)
+                .filter(AreaImovelVersao.id == 1)
+                .scalar()
+            ) or 0
+        except SQLAlchemyError as e:
+            logger.error(f"Erro no banco de dados ao buscar versão da tabela: {str(e)}")
+            raise
+
+        with _versao_lock:
+            _versao_cache = (versao, now + settings.ETAG_VERSION_TTL)
+        return versao
+
+    def warm_up(self) -> None:
+        """
+        Executa uma vez cada consulta do repositório com parâmetros neutros.
+
+        Usado no aquecimento da aplicação, que repete a chamada em cada conexão
+        até o driver preparar as instruções no servidor: compila as instruções
+        no cache do SQLAlchemy e carrega os catálogos e índices na conexão
+        utilizada. O ponto (0, 0) fica no oceano, de modo que as buscas não
+        retornam fazendas. O texto de find_by_points depende do tamanho do
+        lote, então só o lote de um ponto é aquecido.
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        area_wkt = box(-0.001, -0.001, 0.001, 0.001).wkt
+
+        self.get_by_id(0)
+        self.get_revisao(0)
+        self.db.query(AreaImovelVersao.versao).filter(AreaImovelVersao.id == 1).scalar()
+        self.find_by_point(0.0, 0.0)
+        self.find_by_points([(0, 0.0, 0.0)])
+        self.find_by_radius(0.0, 0.0, 1.0, 0, 1)
+        self.find_by_area(area_wkt, 0, 1)
+        if not settings.is_spatialite:
+            self.cluster_centroids(-0.001, -0.001, 0.001, 0.001, 0.001)
+
     def find_by_point(self, latitude: float, longitude: float) -> List[AreaImovel]:
         """
         Encontra todas as fazendas que contêm um ponto específico.
@@ -60,15 +295,26 @@ class FazendaRepository:
                 f"Consultando fazendas que contêm o ponto: ({latitude}, {longitude})"
             )
 
-            fazendas = (
-                self.db.query(AreaImovel)
-                .filter(
-                    func.ST_Contains(
-                        AreaImovel.geom, func.ST_GeomFromText(point_wkt, 4326)
-                    )
+            point = func.ST_GeomFromText(point_wkt, 4326)
+
+            if settings.is_spatialite:
+                criteria = [
+                    AreaImovel.gid.in_(self._candidatos_spatialite(point_wkt)),
+                    # Mesmo predicado do PostgreSQL: pontos na borda também pertencem à fazenda
+                    func.ST_Intersects(AreaImovel.geom, point),
+                ]
+            else:
+                # Consulta as partes subdivididas, cujos bounding boxes são justos,
+                # e retorna as fazendas distintas a que pertencem
+                gids = select(AreaImovelSubdividida.gid).where(
+                    func.ST_Intersects(AreaImovelSubdividida.geom, point)
                 )
-                .all()
-            )
+                criteria = [
+                    AreaImovel.gid.in_(gids),
+                    *self._filtro_estados(longitude, latitude, longitude, latitude),
+                ]
+
+            fazendas = self.db.query(AreaImovel).filter(*criteria).all()
 
             logger.debug(f"Encontradas {len(fazendas)} fazendas que contêm o ponto")
             return fazendas
@@ -78,6 +324,82 @@ class FazendaRepository:
             )
             raise
 
+    def find_by_points(self, points: List[tuple[int, float, float]]) -> List[tuple]:
+        """
+        Encontra as fazendas que contêm cada ponto de um lote.
+
+        Aplica o mesmo critério de find_by_point a todos os pontos em uma única
+        consulta, cruzando a lista de pontos com as geometrias subdivididas.
+
+        Args:
+            points: Lista de (índice, latitude, longitude)
+
+        Returns:
+            Lista de (índice, gid, cod_imovel, municipio, cod_estado), uma linha
+            por par ponto/fazenda; pontos sem fazenda não aparecem
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        if not points:
+            return []
+
+        try:
+            logger.debug(f"Consultando fazendas para lote de {len(points)} pontos")
+
+            if settings.is_spatialite:
+                # Sem geometrias subdivididas, reaproveita a busca por ponto
+                return [
+                    (idx, f.gid, f.cod_imovel, f.municipio, f.cod_estado)
+                    for idx, latitude, longitude in points
+                    for f in self.find_by_point(latitude, longitude)
+                ]
+
+            pontos = values(
+                column("idx", Integer),
+                column("latitude", Float),
+                column("longitude", Float),
+                name="pontos",
+            ).data(points)
+            point = func.ST_SetSRID(
+                func.ST_MakePoint(pontos.c.longitude, pontos.c.latitude), 4326
+            )
+
+            latitudes = [latitude for _, latitude, _ in points]
+            longitudes = [longitude for _, _, longitude in points]
+            query = (
+                select(
+                    pontos.c.idx,
+                    AreaImovel.gid,
+                    AreaImovel.cod_imovel,
+                    AreaImovel.municipio,
+                    AreaImovel.cod_estado,
+                )
+                .distinct()
+                .select_from(pontos)
+                .join(
+                    AreaImovelSubdividida,
+                    func.ST_Intersects(AreaImovelSubdividida.geom, point),
+                )
+                .join(AreaImovel, AreaImovel.gid == AreaImovelSubdividida.gid)
+                .where(
+                    *self._filtro_estados(
+                        min(longitudes), min(latitudes), max(longitudes), max(latitudes)
+                    )
+                )
+                .order_by(pontos.c.idx, AreaImovel.gid)
+            )
+
+            rows = [tuple(row) for row in self.db.execute(query)]
+
+            logger.debug(f"Encontrados {len(rows)} pares ponto/fazenda no lote")
+            return rows
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Erro no banco de dados ao buscar fazendas por lote de pontos: {str(e)}"
+            )
+            raise
+
     def find_by_radius(
         self,
         latitude: float,
@@ -103,22 +425,15 @@ class FazendaRepository:
             SQLAlchemyError: Se ocorrer erro no banco de dados
         """
         try:
-            point_wkt = f"POINT({longitude} {latitude})"
-            radius_meters = radius_km * 1000
-
             logger.debug(
                 f"Consultando fazendas dentro de {radius_km}km de ({latitude}, {longitude}), "
                 f"offset={offset}, limit={limit}"
             )
 
+            criteria = self._criterios_raio(latitude, longitude, radius_km)
+
             # Consulta base
-            base_query = self.db.query(AreaImovel).filter(
-                func.ST_DWithin(
-                    cast(AreaImovel.geom, Geography),
-                    cast(func.ST_GeomFromText(point_wkt, 4326), Geography),
-                    radius_meters,
-                )
-            )
+            base_query = self.db.query(AreaImovel).filter(*criteria)
 
             # Obtém contagem total
             total_count = base_query.count()
@@ -136,3 +451,176 @@ class FazendaRepository:
                 f"Erro no banco de dados ao buscar fazendas por raio: {str(e)}"
             )
             raise
+
+    def find_by_area(
+        self, area_wkt: str, offset: int, limit: int
+    ) -> tuple[List[AreaImovel], int]:
+        """
+        Encontra todas as fazendas que intersectam uma área com paginação.
+
+        Args:
+            area_wkt: Geometria da área em WKT (SRID 4326)
+            offset: Número de registros a pular
+            limit: Número máximo de registros a retornar
+
+        Returns:
+            Tupla de (lista de fazendas, contagem total)
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            logger.debug(
+                f"Consultando fazendas que intersectam área, offset={offset}, limit={limit}"
+            )
+
+            criteria = self._criterios_area(area_wkt)
+
+            base_query = self.db.query(AreaImovel).filter(*criteria)
+
+            total_count = base_query.count()
+
+            fazendas = (
+                base_query.order_by(AreaImovel.gid).offset(offset).limit(limit).all()
+            )
+
+            logger.debug(
+                f"Encontradas {total_count} fazendas no total, retornando {len(fazendas)} nesta página"
+            )
+            return fazendas, total_count
+
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Erro no banco de dados ao buscar fazendas por área: {str(e)}"
+            )
+            raise
+
+    def stream_by_radius(
+        self, latitude: float, longitude: float, radius_km: float, batch_size: int
+    ) -> Iterator[list]:
+        """
+        Percorre as fazendas dentro de um raio em lotes, para exportação.
+
+        Args:
+            latitude: Latitude do ponto central
+            longitude: Longitude do ponto central
+            radius_km: Raio de busca em quilômetros
+            batch_size: Número de linhas por lote
+
+        Yields:
+            Listas de linhas com as colunas de EXPORT_COLUMNS (geometria em WKB)
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        logger.debug(
+            f"Exportando fazendas dentro de {radius_km}km de ({latitude}, {longitude})"
+        )
+        return self._stream(
+            self._criterios_raio(latitude, longitude, radius_km), batch_size
+        )
+
+    def stream_by_area(self, area_wkt: str, batch_size: int) -> Iterator[list]:
+        """
+        Percorre as fazendas que intersectam uma área em lotes, para exportação.
+
+        Args:
+            area_wkt: Geometria da área em WKT (SRID 4326)
+            batch_size: Número de linhas por lote
+
+        Yields:
+            Listas de linhas com as colunas de EXPORT_COLUMNS (geometria em WKB)
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        logger.debug("Exportando fazendas que intersectam área")
+        return self._stream(self._criterios_area(area_wkt), batch_size)
+
+    def _stream(self, criteria: list, batch_size: int) -> Iterator[list]:
+        """Executa a consulta com cursor no servidor e entrega as linhas em lotes."""
+        columns = [
+            AreaImovel.__table__.c[name] for name in EXPORT_COLUMNS if name != "geom"
+        ]
+        query = (
+            select(*columns, func.ST_AsBinary(AreaImovel.geom).label("geom"))
+            .where(*criteria)
+            .order_by(AreaImovel.gid)
+        )
+
+        try:
+            result = self.db.execute(
+                query.execution_options(stream_results=True, yield_per=batch_size)
+            )
+            for partition in result.partitions():
+                yield partition
+        except SQLAlchemyError as e:
+            logger.error(f"Erro no banco de dados ao exportar fazendas: {str(e)}")
+            raise
+
+    def cluster_centroids(
+        self,
+        min_longitude: float,
+        min_latitude: float,
+        max_longitude: float,
+        max_latitude: float,
+        cell_size: float,
+    ) -> List[dict]:
+        """
+        Agrupa os centróides das fazendas de um bounding box em uma grade regular.
+
+        Args:
+            min_longitude: Longitude mínima do bounding box
+            min_latitude: Latitude mínima do bounding box
+            max_longitude: Longitude máxima do bounding box
+            max_latitude: Latitude máxima do bounding box
+            cell_size: Tamanho da célula da grade em graus
+
+        Returns:
+            Lista de clusters com posição média, contagem, área total e GID mínimo
+
+        Raises:
+            SQLAlchemyError: Se ocorrer erro no banco de dados
+        """
+        try:
+            logger.debug(
+                f"Agrupando fazendas em ({min_longitude}, {min_latitude}, "
+                f"{max_longitude}, {max_latitude}) com células de {cell_size} graus"
+            )
+
+            envelope = func.ST_MakeEnvelope(
+                min_longitude, min_latitude, max_longitude, max_latitude, 4326
+            )
+            centroid = func.ST_Centroid(AreaImovel.geom)
+
+            rows = (
+                self.db.query(
+                    func.floor(func.ST_X(centroid) / cell_size).label("cell_x"),
+                    func.floor(func.ST_Y(centroid) / cell_size).label("cell_y"),
+                    func.count().label("count"),
+                    func.sum(literal_column(AREA_NUMERICA_SQL)).label("area_total"),
+                    func.avg(func.ST_X(centroid)).label("longitude"),
+                    func.avg(func.ST_Y(centroid)).label("latitude"),
+                    func.min(AreaImovel.gid).label("gid"),
+                )
+                # Cada fazenda pertence à célula do seu centróide, evitando
+                # contagem duplicada entre bounding boxes vizinhos
+                .filter(
+                    AreaImovel.geom.op("&&")(envelope),
+                    func.ST_Intersects(centroid, envelope),
+                    *self._filtro_estados(
+                        min_longitude, min_latitude, max_longitude, max_latitude
+                    ),
+                )
+                .group_by("cell_x", "cell_y")
+                .all()
+            )
+
+            logger.debug(f"Gerados {len(rows)} clusters")
+            return [dict(row._mapping) for row in rows]
+
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Erro no banco de dados ao agrupar fazendas: {str(e)}"
+            )
+            raise
@@ -1,5 +1,6 @@
 """Routes package for Fazendas API."""
 
 from app.fazendas.routes.fazendas import router
+from app.fazendas.routes.geofence import router as geofence_router
 
-__all__ = ["router"]
+__all__ = ["router", "geofence_router"]
@@ -1,27 +1,76 @@
 """Rotas da API para endpoints de Fazenda."""
 
+import itertools
 import logging
-from typing import List
+from typing import Iterator, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.exceptions import DatabaseException, FazendaNotFoundException
+from app.core.config import get_settings
+from app.core.database import database_error, get_db, require_postgresql
+from app.core.exceptions import (
+    FazendaNotFoundException,
+    InvalidCoordinatesException,
+    JobNotFoundException,
+    JobNotReadyException,
+    UploadTooLargeException,
+)
+from app.core.jobs import JOB_COMPLETED, get_job_manager
+from app.fazendas.repositories.coalescing_repository import (
+    CoalescingFazendaRepository,
+)
+from app.fazendas.repositories.estatisticas_repository import EstatisticasRepository
 from app.fazendas.repositories.fazenda_repository import FazendaRepository
 from app.fazendas.schemas import (
+    AreaFiltro,
+    BuscaAreaRequest,
+    BuscaAreaResponse,
     BuscaPontoRequest,
     BuscaRaioRequest,
     BuscaRaioResponse,
+    ClustersResponse,
+    EstatisticaSchema,
     FazendaSchema,
+    JobSchema,
+    RaioFiltro,
 )
 from app.fazendas.services.fazenda_service import FazendaService
+from app.fazendas.services.spatial_join_service import SpatialJoinService
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 router = APIRouter()
 
+# Bytes do upload de jobs acumulados antes de cada escrita em disco
+JOBS_UPLOAD_BUFFER_BYTES = 1024 * 1024
+
+
+def _nao_modificado(etag: str) -> Response:
+    """Resposta 304 para requisições condicionais cujo ETag ainda é válido."""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _etag_fazenda(
+    repository: FazendaRepository, gid: int, dat_atuali: Optional[str]
+) -> str:
+    """ETag de uma fazenda, derivado da sua data de atualização."""
+    # Sem data de atualização, a versão da tabela garante a invalidação
+    revisao = dat_atuali if dat_atuali else f"v{repository.get_version()}"
+    return FazendaService.etag("fazenda", gid, revisao)
+
+
+def _etag_busca(repository: FazendaRepository, endpoint: str, request) -> str:
+    """ETag de uma busca, derivado dos parâmetros e da versão da tabela."""
+    return FazendaService.etag(
+        endpoint, repository.get_version(), request.model_dump_json()
+    )
+
 
 @router.get(
     "/{gid}",
@@ -30,16 +79,35 @@ router = APIRouter()
     description="Retorna os dados de uma fazenda específica pelo seu GID",
     responses={
         200: {"description": "Fazenda encontrada com sucesso"},
+        304: {"description": "Fazenda não modificada desde o ETag informado"},
         404: {"description": "Fazenda não encontrada"},
         500: {"description": "Erro interno do servidor"},
     },
 )
-def get_fazenda(gid: int, db: Session = Depends(get_db)):
+def get_fazenda(
+    gid: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
     """Busca fazenda por GID."""
     try:
         logger.info(f"Buscando fazenda com GID: {gid}")
 
         repository = FazendaRepository(db)
+
+        # Requisição condicional: valida o ETag sem carregar a geometria
+        if if_none_match:
+            revisao = repository.get_revisao(gid)
+            if revisao is None:
+                logger.warning(f"Fazenda com GID {gid} não encontrada")
+                raise FazendaNotFoundException(gid)
+
+            etag = _etag_fazenda(repository, gid, revisao.dat_atuali)
+            if FazendaService.etag_matches(if_none_match, etag):
+                logger.info(f"Fazenda {gid} não modificada")
+                return _nao_modificado(etag)
+
         fazenda = repository.get_by_id(gid)
 
         if not fazenda:
@@ -49,13 +117,13 @@ def get_fazenda(gid: int, db: Session = Depends(get_db)):
         logger.info(
             f"Fazenda {gid} encontrada: {fazenda.municipio}/{fazenda.cod_estado}"
         )
+        response.headers["ETag"] = _etag_fazenda(repository, gid, fazenda.dat_atuali)
         return FazendaService.serialize_fazenda(fazenda)
 
     except FazendaNotFoundException:
         raise
     except SQLAlchemyError as e:
-        logger.error(f"Erro de banco de dados ao buscar fazenda {gid}: {str(e)}")
-        raise DatabaseException("Erro ao buscar fazenda no banco de dados")
+        raise database_error(e, f"ao buscar fazenda {gid}", "Erro ao buscar fazenda no banco de dados")
     except Exception as e:
         logger.error(f"Erro inesperado ao buscar fazenda {gid}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -68,26 +136,38 @@ def get_fazenda(gid: int, db: Session = Depends(get_db)):
     description="Retorna todas as fazendas que contêm o ponto especificado (latitude/longitude)",
     responses={
         200: {"description": "Busca realizada com sucesso"},
+        304: {"description": "Resultado não modificado desde o ETag informado"},
         400: {"description": "Coordenadas inválidas"},
         500: {"description": "Erro interno do servidor"},
     },
 )
-def busca_ponto(request: BuscaPontoRequest, db: Session = Depends(get_db)):
+def busca_ponto(
+    request: BuscaPontoRequest,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
     """Busca fazendas que contêm um ponto específico."""
     try:
         logger.info(
             f"Buscando fazendas no ponto: ({request.latitude}, {request.longitude})"
         )
 
-        repository = FazendaRepository(db)
+        repository = CoalescingFazendaRepository(db)
+
+        etag = _etag_busca(repository, "busca_ponto", request)
+        if FazendaService.etag_matches(if_none_match, etag):
+            logger.info("Resultado da busca por ponto não modificado")
+            return _nao_modificado(etag)
+
         fazendas = repository.find_by_point(request.latitude, request.longitude)
 
         logger.info(f"Encontradas {len(fazendas)} fazendas no ponto especificado")
+        response.headers["ETag"] = etag
         return [FazendaService.serialize_fazenda(f) for f in fazendas]
 
     except SQLAlchemyError as e:
-        logger.error(f"Erro de banco de dados na busca por ponto: {str(e)}")
-        raise DatabaseException("Erro ao buscar fazendas no banco de dados")
+        raise database_error(e, "na busca por ponto", "Erro ao buscar fazendas no banco de dados")
     except Exception as e:
         logger.error(f"Erro inesperado na busca por ponto: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -100,11 +180,17 @@ def busca_ponto(request: BuscaPontoRequest, db: Session = Depends(get_db)):
     description="Retorna todas as fazendas dentro de um raio (em km) a partir de um ponto central, com paginação",
     responses={
         200: {"description": "Busca realizada com sucesso"},
+        304: {"description": "Resultado não modificado desde o ETag informado"},
         400: {"description": "Parâmetros inválidos"},
         500: {"description": "Erro interno do servidor"},
     },
 )
-def busca_raio(request: BuscaRaioRequest, db: Session = Depends(get_db)):
+def busca_raio(
+    request: BuscaRaioRequest,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
     """Busca fazendas dentro de um raio a partir de um ponto com paginação."""
     try:
         logger.info(
@@ -112,13 +198,19 @@ def busca_raio(request: BuscaRaioRequest, db: Session = Depends(get_db)):
             f"({request.latitude}, {request.longitude}) - Página {request.page}, Tamanho {request.page_size}"
         )
 
+        repository = CoalescingFazendaRepository(db)
+
+        etag = _etag_busca(repository, "busca_raio", request)
+        if FazendaService.etag_matches(if_none_match, etag):
+            logger.info("Resultado da busca por raio não modificado")
+            return _nao_modificado(etag)
+
         # Calcula paginação
         offset, _ = FazendaService.calculate_pagination(
             0, request.page, request.page_size
         )
 
         # Obtém fazendas do repositório
-        repository = FazendaRepository(db)
         fazendas, total_count = repository.find_by_radius(
             request.latitude,
             request.longitude,
@@ -137,6 +229,7 @@ def busca_raio(request: BuscaRaioRequest, db: Session = Depends(get_db)):
             f"retornando {len(fazendas)} na página {request.page}/{total_pages}"
         )
 
+        response.headers["ETag"] = etag
         return BuscaRaioResponse(
             count=total_count,
             page=request.page,
@@ -147,8 +240,492 @@ def busca_raio(request: BuscaRaioRequest, db: Session = Depends(get_db)):
         )
 
     except SQLAlchemyError as e:
-        logger.error(f"Erro de banco de dados na busca por raio: {str(e)}")
-        raise DatabaseException("Erro ao buscar fazendas no banco de dados")
+        raise database_error(e, "na busca por raio", "Erro ao buscar fazendas no banco de dados")
     except Exception as e:
         logger.error(f"Erro inesperado na busca por raio: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.post(
+    "/busca-area",
+    response_model=BuscaAreaResponse,
+    summary="Buscar fazendas por área",
+    description="Retorna todas as fazendas que intersectam um polígono GeoJSON ou bounding box, com paginação",
+    responses={
+        200: {"description": "Busca realizada com sucesso"},
+        304: {"description": "Resultado não modificado desde o ETag informado"},
+        400: {"description": "Geometria inválida ou fora dos limites permitidos"},
+        500: {"description": "Erro interno do servidor"},
+    },
+)
+def busca_area(
+    request: BuscaAreaRequest,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Busca fazendas que intersectam um polígono ou bounding box com paginação."""
+    try:
+        area, area_km2 = FazendaService.build_search_area(
+            request.geometry, request.bbox
+        )
+
+        logger.info(
+            f"Buscando fazendas em área de {area_km2:.2f}km² "
+            f"- Página {request.page}, Tamanho {request.page_size}"
+        )
+
+        repository = CoalescingFazendaRepository(db)
+
+        etag = _etag_busca(repository, "busca_area", request)
+        if FazendaService.etag_matches(if_none_match, etag):
+            logger.info("Resultado da busca por área não modificado")
+            return _nao_modificado(etag)
+
+        offset, _ = FazendaService.calculate_pagination(
+            0, request.page, request.page_size
+        )
+
+        fazendas, total_count = repository.find_by_area(
+            area.wkt, offset, request.page_size
+        )
+
+        _, total_pages = FazendaService.calculate_pagination(
+            total_count, request.page, request.page_size
+        )
+
+        logger.info(
+            f"Encontradas {total_count} fazendas no total, "
+            f"retornando {len(fazendas)} na página {request.page}/{total_pages}"
+        )
+
+        response.headers["ETag"] = etag
+        return BuscaAreaResponse(
+            count=total_count,
+            page=request.page,
+            page_size=request.page_size,
+            total_pages=total_pages,
+            area_km2=area_km2,
+            results=[FazendaService.serialize_fazenda(f) for f in fazendas],
+        )
+
+    except InvalidCoordinatesException:
+        raise
+    except SQLAlchemyError as e:
+        raise database_error(e, "na busca por área", "Erro ao buscar fazendas no banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado na busca por área: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.get(
+    "/estatisticas/estados",
+    response_model=List[EstatisticaSchema],
+    summary="Estatísticas por estado",
+    description="Retorna contagem, área total e mediana de área das fazendas por estado",
+    dependencies=[Depends(require_postgresql)],
+    responses={
+        200: {"description": "Estatísticas retornadas com sucesso"},
+        500: {"description": "Erro interno do servidor"},
+        501: {"description": "Indisponível no backend SpatiaLite"},
+    },
+)
+def estatisticas_estados(db: Session = Depends(get_db)):
+    """Retorna estatísticas agregadas por estado."""
+    try:
+        logger.info("Buscando estatísticas por estado")
+        return EstatisticasRepository(db).by_estado()
+
+    except SQLAlchemyError as e:
+        raise database_error(e, "nas estatísticas por estado", "Erro ao buscar estatísticas no banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado nas estatísticas por estado: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.get(
+    "/estatisticas/municipios",
+    response_model=List[EstatisticaSchema],
+    summary="Estatísticas por município",
+    description="Retorna contagem, área total e mediana de área das fazendas por município",
+    dependencies=[Depends(require_postgresql)],
+    responses={
+        200: {"description": "Estatísticas retornadas com sucesso"},
+        500: {"description": "Erro interno do servidor"},
+        501: {"description": "Indisponível no backend SpatiaLite"},
+    },
+)
+def estatisticas_municipios(
+    cod_estado: Optional[str] = Query(None, description="Filtra por código do estado"),
+    db: Session = Depends(get_db),
+):
+    """Retorna estatísticas agregadas por município."""
+    try:
+        logger.info(f"Buscando estatísticas por município (estado={cod_estado})")
+        return EstatisticasRepository(db).by_municipio(cod_estado)
+
+    except SQLAlchemyError as e:
+        raise database_error(e, "nas estatísticas por município", "Erro ao buscar estatísticas no banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado nas estatísticas por município: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.get(
+    "/estatisticas/status",
+    response_model=List[EstatisticaSchema],
+    summary="Estatísticas por status",
+    description="Retorna contagem, área total e mediana de área das fazendas por status do imóvel em cada estado",
+    dependencies=[Depends(require_postgresql)],
+    responses={
+        200: {"description": "Estatísticas retornadas com sucesso"},
+        500: {"description": "Erro interno do servidor"},
+        501: {"description": "Indisponível no backend SpatiaLite"},
+    },
+)
+def estatisticas_status(
+    cod_estado: Optional[str] = Query(None, description="Filtra por código do estado"),
+    db: Session = Depends(get_db),
+):
+    """Retorna estatísticas agregadas por status do imóvel."""
+    try:
+        logger.info(f"Buscando estatísticas por status (estado={cod_estado})")
+        return EstatisticasRepository(db).by_status(cod_estado)
+
+    except SQLAlchemyError as e:
+        raise database_error(e, "nas estatísticas por status", "Erro ao buscar estatísticas no banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado nas estatísticas por status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.get(
+    "/mapa/clusters",
+    response_model=ClustersResponse,
+    summary="Clusters de fazendas para mapas",
+    description="Agrupa as fazendas de um bounding box em uma grade definida pelo zoom, "
+    "retornando a posição média dos centróides, a contagem e a área total de cada célula",
+    dependencies=[Depends(require_postgresql)],
+    responses={
+        200: {"description": "Clusters gerados com sucesso"},
+        307: {"description": "Redirecionamento para o bbox alinhado à grade"},
+        400: {"description": "Bounding box inválido ou grande demais para o zoom"},
+        500: {"description": "Erro interno do servidor"},
+        501: {"description": "Indisponível no backend SpatiaLite"},
+    },
+)
+def mapa_clusters(
+    request: Request,
+    response: Response,
+    min_longitude: float = Query(..., ge=-180, le=180, description="Longitude mínima"),
+    min_latitude: float = Query(..., ge=-90, le=90, description="Latitude mínima"),
+    max_longitude: float = Query(..., ge=-180, le=180, description="Longitude máxima"),
+    max_latitude: float = Query(..., ge=-90, le=90, description="Latitude máxima"),
+    zoom: int = Query(..., ge=0, le=22, description="Nível de zoom do mapa"),
+    db: Session = Depends(get_db),
+):
+    """Agrupa fazendas em clusters para visualização em mapas."""
+    try:
+        if min_longitude >= max_longitude or min_latitude >= max_latitude:
+            raise InvalidCoordinatesException(
+                "Bounding box inválido: mínimos devem ser menores que máximos"
+            )
+
+        requested = [min_longitude, min_latitude, max_longitude, max_latitude]
+        cell_size, bbox = FazendaService.cluster_grid(requested, zoom)
+
+        cache_control = f"public, max-age={settings.CLUSTER_CACHE_MAX_AGE}"
+        if bbox != requested:
+            # Redireciona para a URL do bbox alinhado: visualizações próximas passam
+            # a compartilhar a mesma URL e, portanto, a mesma entrada nos caches HTTP
+            url = request.url.include_query_params(
+                min_longitude=bbox[0],
+                min_latitude=bbox[1],
+                max_longitude=bbox[2],
+                max_latitude=bbox[3],
+            )
+            return RedirectResponse(
+                str(url), status_code=307, headers={"Cache-Control": cache_control}
+            )
+
+        logger.info(f"Gerando clusters no zoom {zoom} para bbox {bbox}")
+
+        repository = CoalescingFazendaRepository(db)
+        clusters = repository.cluster_centroids(*bbox, cell_size)
+
+        logger.info(f"Gerados {len(clusters)} clusters no zoom {zoom}")
+
+        # A resposta depende apenas do bbox alinhado e do zoom, podendo ser
+        # armazenada em cache por tile
+        response.headers["Cache-Control"] = cache_control
+
+        return ClustersResponse(
+            zoom=zoom,
+            cell_size=cell_size,
+            bbox=bbox,
+            clusters=[FazendaService.serialize_cluster(c) for c in clusters],
+        )
+
+    except InvalidCoordinatesException:
+        raise
+    except SQLAlchemyError as e:
+        raise database_error(e, "ao gerar clusters", "Erro ao buscar fazendas no banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado ao gerar clusters: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+def _resposta_exportacao(
+    lotes: Iterator[list], formato: str, nome: str
+) -> StreamingResponse:
+    """
+    Monta a resposta de exportação em streaming.
+
+    O primeiro lote é consultado antes do envio dos cabeçalhos, para que erros
+    de banco de dados ainda resultem em uma resposta de erro adequada.
+    """
+    # pyarrow é importado sob demanda (e pré-carregado no aquecimento da aplicação)
+    from app.fazendas.services.export_service import (
+        EXTENSOES,
+        MEDIA_TYPES,
+        ExportService,
+    )
+
+    primeiro = next(lotes, None)
+    linhas = itertools.chain([primeiro], lotes) if primeiro is not None else lotes
+    batches = (ExportService.record_batch(rows) for rows in linhas)
+
+    return StreamingResponse(
+        ExportService.stream(batches, formato),
+        media_type=MEDIA_TYPES[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{nome}.{EXTENSOES[formato]}"'
+        },
+    )
+
+
+@router.post(
+    "/exportar/raio",
+    summary="Exportar fazendas por raio",
+    description="Exporta todas as fazendas dentro de um raio como GeoParquet ou Arrow IPC stream, "
+    "com geometria em WKB",
+    responses={
+        200: {"description": "Arquivo gerado com sucesso"},
+        400: {"description": "Parâmetros inválidos"},
+        500: {"description": "Erro interno do servidor"},
+    },
+)
+def exportar_raio(
+    request: RaioFiltro,
+    formato: Literal["parquet", "arrow"] = Query(
+        "parquet", description="Formato do arquivo: GeoParquet ou Arrow IPC stream"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Exporta fazendas dentro de um raio a partir de um ponto."""
+    try:
+        logger.info(
+            f"Exportando ({formato}) fazendas em raio de {request.raio_km}km do ponto: "
+            f"({request.latitude}, {request.longitude})"
+        )
+
+        repository = FazendaRepository(db)
+        lotes = repository.stream_by_radius(
+            request.latitude,
+            request.longitude,
+            request.raio_km,
+            settings.EXPORT_BATCH_SIZE,
+        )
+
+        return _resposta_exportacao(lotes, formato, "fazendas_raio")
+
+    except SQLAlchemyError as e:
+        raise database_error(e, "na exportação por raio", "Erro ao exportar fazendas do banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado na exportação por raio: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.post(
+    "/exportar/area",
+    summary="Exportar fazendas por área",
+    description="Exporta todas as fazendas que intersectam um polígono GeoJSON ou bounding box "
+    "como GeoParquet ou Arrow IPC stream, com geometria em WKB",
+    responses={
+        200: {"description": "Arquivo gerado com sucesso"},
+        400: {"description": "Geometria inválida ou fora dos limites permitidos"},
+        500: {"description": "Erro interno do servidor"},
+    },
+)
+def exportar_area(
+    request: AreaFiltro,
+    formato: Literal["parquet", "arrow"] = Query(
+        "parquet", description="Formato do arquivo: GeoParquet ou Arrow IPC stream"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Exporta fazendas que intersectam um polígono ou bounding box."""
+    try:
+        area, area_km2 = FazendaService.build_search_area(
+            request.geometry, request.bbox
+        )
+
+        logger.info(f"Exportando ({formato}) fazendas em área de {area_km2:.2f}km²")
+
+        repository = FazendaRepository(db)
+        lotes = repository.stream_by_area(area.wkt, settings.EXPORT_BATCH_SIZE)
+
+        return _resposta_exportacao(lotes, formato, "fazendas_area")
+
+    except InvalidCoordinatesException:
+        raise
+    except SQLAlchemyError as e:
+        raise database_error(e, "na exportação por área", "Erro ao exportar fazendas do banco de dados")
+    except Exception as e:
+        logger.error(f"Erro inesperado na exportação por área: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+def _validar_entrada_job(path: str) -> None:
+    """Valida a codificação e o cabeçalho do CSV de pontos gravado em disco."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            SpatialJoinService.validate_header(f.readline())
+    except UnicodeDecodeError:
+        raise InvalidCoordinatesException("O arquivo deve estar codificado em UTF-8")
+
+
+def _job_schema(status: dict, http_request: Request) -> JobSchema:
+    """Monta a resposta de estado de um job, com progresso e URL do resultado."""
+    completed = status["status"] == JOB_COMPLETED
+    total = status.get("total") or 0
+    progress = status.get("processed", 0) / total if total else float(completed)
+
+    return JobSchema(
+        **status,
+        progress=round(min(progress, 1.0), 4),
+        result_url=(
+            str(http_request.url_for("resultado_job", job_id=status["id"]))
+            if completed
+            else None
+        ),
+    )
+
+
+@router.post(
+    "/jobs",
+    response_model=JobSchema,
+    status_code=202,
+    summary="Criar job de cruzamento de pontos",
+    description="Recebe um CSV de pontos (cabeçalho com latitude, longitude e, opcionalmente, id) "
+    "no corpo da requisição e o cruza com as fazendas em segundo plano",
+    responses={
+        202: {"description": "Job criado e enfileirado"},
+        400: {"description": "Arquivo inválido"},
+        413: {"description": "Arquivo maior que o limite permitido"},
+        500: {"description": "Erro interno do servidor"},
+    },
+)
+async def criar_job(http_request: Request):
+    """
+    Cria um job de cruzamento em lote de pontos com fazendas.
+
+    O corpo é gravado em disco à medida que chega, sem carregá-lo em memória.
+    Todo acesso a disco roda no threadpool, em blocos de até
+    JOBS_UPLOAD_BUFFER_BYTES, para que uploads grandes não bloqueiem o event loop.
+    """
+    store = get_job_manager().store
+    job_id = await run_in_threadpool(store.create)
+    max_bytes = settings.JOBS_MAX_UPLOAD_MB * 1024 * 1024
+
+    try:
+        size = lines = 0
+        last_byte = b"\n"
+        buffer = bytearray()
+        f = await run_in_threadpool(open, store.input_path(job_id), "wb")
+        try:
+            async for chunk in http_request.stream():
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeException(settings.JOBS_MAX_UPLOAD_MB)
+                lines += chunk.count(b"\n")
+                last_byte = chunk[-1:]
+                buffer += chunk
+                if len(buffer) >= JOBS_UPLOAD_BUFFER_BYTES:
+                    await run_in_threadpool(f.write, buffer)
+                    buffer.clear()
+            if buffer:
+                await run_in_threadpool(f.write, buffer)
+        finally:
+            await run_in_threadpool(f.close)
+
+        await run_in_threadpool(_validar_entrada_job, store.input_path(job_id))
+
+        # Linhas de dados, descontando o cabeçalho
+        total = max(lines + (last_byte != b"\n") - 1, 0)
+        status = await run_in_threadpool(store.update_status, job_id, total=total)
+
+        get_job_manager().submit(
+            job_id,
+            lambda jid, progress: SpatialJoinService.process(
+                store.input_path(jid), store.result_path(jid), progress
+            ),
+        )
+
+        logger.info(f"Job {job_id} criado com {total} pontos ({size} bytes)")
+        return _job_schema(status, http_request)
+
+    except (InvalidCoordinatesException, UploadTooLargeException):
+        await run_in_threadpool(store.delete, job_id)
+        raise
+    except Exception as e:
+        await run_in_threadpool(store.delete, job_id)
+        logger.error(f"Erro inesperado ao criar job: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobSchema,
+    summary="Consultar job",
+    description="Retorna o estado e o progresso de um job de cruzamento de pontos",
+    responses={
+        200: {"description": "Estado do job"},
+        404: {"description": "Job não encontrado"},
+    },
+)
+def consultar_job(job_id: str, http_request: Request):
+    """Consulta o estado de um job."""
+    status = get_job_manager().store.read_status(job_id)
+    if status is None:
+        raise JobNotFoundException(job_id)
+    return _job_schema(status, http_request)
+
+
+@router.get(
+    "/jobs/{job_id}/resultado",
+    summary="Baixar resultado do job",
+    description="Retorna o CSV de resultado de um job concluído, com uma linha por par ponto/fazenda",
+    response_class=FileResponse,
+    responses={
+        200: {"description": "CSV de resultado", "content": {"text/csv": {}}},
+        404: {"description": "Job não encontrado"},
+        409: {"description": "Job ainda não concluído"},
+    },
+)
+def resultado_job(job_id: str):
+    """Baixa o resultado de um job concluído."""
+    store = get_job_manager().store
+    status = store.read_status(job_id)
+    if status is None:
+        raise JobNotFoundException(job_id)
+    if status["status"] != JOB_COMPLETED:
+        raise JobNotReadyException(job_id, status["status"])
+
+    return FileResponse(
+        store.result_path(job_id),
+        media_type="text/csv",
+        filename=f"fazendas_{job_id}.csv",
+    )
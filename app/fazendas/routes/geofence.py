@@ -0,0 +1,136 @@
+"""Rota WebSocket para eventos de entrada e saída de dispositivos em fazendas."""
+
+import logging
+from typing import List, Optional
+
+from anyio import from_thread
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.admission import get_admission_limiter
+from app.core.config import get_settings
+from app.core.database import database_error, get_session_factory, set_statement_timeout
+from app.core.exceptions import InvalidCoordinatesException
+from app.fazendas.models_sqla import AreaImovel
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+from app.fazendas.schemas import PosicaoDispositivo
+from app.fazendas.services.geofence_service import GeofenceTracker
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+router = APIRouter()
+
+
+def _buscar_fazendas(latitude: float, longitude: float) -> List[AreaImovel]:
+    """
+    Consulta indexada das fazendas que contêm o ponto, em uma sessão própria.
+
+    A conexão volta ao pool ao fim de cada consulta, para que conexões
+    WebSocket de longa duração não retenham conexões do banco.
+    """
+    db = get_session_factory()()
+    try:
+        set_statement_timeout(
+            db,
+            settings.DB_STATEMENT_TIMEOUTS.get(
+                "busca_ponto", settings.DB_STATEMENT_TIMEOUT_MS
+            ),
+        )
+        return FazendaRepository(db).find_by_point(latitude, longitude)
+    finally:
+        db.close()
+
+
+def _buscar_fazendas_admitido(latitude: float, longitude: float) -> List[AreaImovel]:
+    """
+    Executa _buscar_fazendas dentro do controle de admissão.
+
+    Chamada pelo GeofenceTracker no threadpool; a reserva e a liberação de
+    capacidade rodam no event loop, onde o limitador é usado pelas demais rotas.
+
+    Raises:
+        ServiceOverloadedException: Se a consulta não for admitida
+    """
+    limiter = get_admission_limiter()
+    weight = settings.ADMISSION_WEIGHTS.get("geofence", 1)
+    from_thread.run(limiter.acquire, weight)
+    try:
+        return _buscar_fazendas(latitude, longitude)
+    finally:
+        from_thread.run_sync(limiter.release, weight)
+
+
+async def _processar(tracker: GeofenceTracker, mensagem: Optional[str]) -> List[dict]:
+    """
+    Processa uma mensagem de posição e retorna os eventos gerados.
+
+    Raises:
+        HTTPException: Se a mensagem for inválida, a consulta não for admitida
+            ou falhar
+    """
+    if mensagem is None:
+        raise InvalidCoordinatesException("Posições devem ser enviadas como JSON em mensagens de texto")
+
+    try:
+        posicao = PosicaoDispositivo.model_validate_json(mensagem)
+    except ValidationError as e:
+        erro = e.errors()[0]
+        raise InvalidCoordinatesException(
+            f"Posição inválida: {'.'.join(map(str, erro['loc']))} - {erro['msg']}"
+        )
+
+    try:
+        eventos = await run_in_threadpool(
+            tracker.update, posicao.device_id, posicao.latitude, posicao.longitude
+        )
+    except ValueError as e:
+        raise InvalidCoordinatesException(str(e))
+    except SQLAlchemyError as e:
+        raise database_error(e, "no geofence", "Erro ao buscar fazendas no banco de dados")
+
+    for evento in eventos:
+        evento["timestamp"] = posicao.timestamp
+    return eventos
+
+
+@router.websocket("/geofence", name="geofence")
+async def geofence(websocket: WebSocket):
+    """
+    Recebe posições de dispositivos e emite eventos de entrada e saída de fazendas.
+
+    Cada mensagem do cliente é um JSON com device_id, latitude, longitude e,
+    opcionalmente, timestamp. Para cada fazenda em que o dispositivo entra ou
+    de que sai, o servidor envia um JSON com event ("enter" ou "exit"),
+    device_id, gid, cod_imovel, latitude, longitude e timestamp. Mensagens
+    inválidas (inclusive binárias), consultas rejeitadas pelo controle de
+    admissão (503) e falhas de consulta geram um evento "error" com
+    status_code e detail, sem encerrar a conexão.
+    """
+    await websocket.accept()
+    tracker = GeofenceTracker(
+        _buscar_fazendas_admitido,
+        recheck_every=settings.GEOFENCE_RECHECK_EVERY,
+        max_devices=settings.GEOFENCE_MAX_DEVICES,
+    )
+    logger.info("Conexão de geofence aberta")
+
+    try:
+        while True:
+            mensagem = await websocket.receive()
+            if mensagem["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(mensagem.get("code", 1000), mensagem.get("reason"))
+            try:
+                eventos = await _processar(tracker, mensagem.get("text"))
+            except HTTPException as e:
+                await websocket.send_json(
+                    {"event": "error", "status_code": e.status_code, "detail": e.detail}
+                )
+                continue
+
+            for evento in eventos:
+                await websocket.send_json(evento)
+    except WebSocketDisconnect:
+        logger.info(f"Conexão de geofence encerrada: {tracker.stats()}")
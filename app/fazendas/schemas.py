@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class FazendaSchema(BaseModel):
@@ -67,8 +67,8 @@ class BuscaPontoRequest(BaseModel):
         return v
 
 
-class BuscaRaioRequest(BaseModel):
-    """Request schema for radius-based search."""
+class RaioFiltro(BaseModel):
+    """Radius filter shared by radius-based search and export."""
 
     latitude: float = Field(
         ...,
@@ -87,10 +87,6 @@ class BuscaRaioRequest(BaseModel):
     raio_km: float = Field(
         ..., description="Raio de busca em quilômetros", gt=0, le=1000, example=10.0
     )
-    page: int = Field(1, description="Número da página (começa em 1)", ge=1, example=1)
-    page_size: int = Field(
-        10, description="Quantidade de resultados por página", ge=1, le=100, example=10
-    )
 
     @field_validator("raio_km")
     @classmethod
@@ -101,6 +97,15 @@ class BuscaRaioRequest(BaseModel):
             raise ValueError("Raio máximo permitido é 1000 km")
         return v
 
+
+class BuscaRaioRequest(RaioFiltro):
+    """Request schema for radius-based search."""
+
+    page: int = Field(1, description="Número da página (começa em 1)", ge=1, example=1)
+    page_size: int = Field(
+        10, description="Quantidade de resultados por página", ge=1, le=100, example=10
+    )
+
     @field_validator("page_size")
     @classmethod
     def validate_page_size(cls, v: int) -> int:
@@ -126,3 +131,164 @@ class BuscaRaioResponse(BaseModel):
     results: List[FazendaSchema] = Field(
         ..., description="Lista de fazendas encontradas nesta página"
     )
+
+
+class AreaFiltro(BaseModel):
+    """Area filter (GeoJSON polygon or bounding box) shared by area-based search and export."""
+
+    geometry: Optional[dict] = Field(
+        None,
+        description="Geometria GeoJSON (Polygon ou MultiPolygon) em WGS84",
+        example={
+            "type": "Polygon",
+            "coordinates": [
+                [
+                    [-50.80, -21.72],
+                    [-50.70, -21.72],
+                    [-50.70, -21.64],
+                    [-50.80, -21.64],
+                    [-50.80, -21.72],
+                ]
+            ],
+        },
+    )
+    bbox: Optional[List[float]] = Field(
+        None,
+        description="Bounding box [min_longitude, min_latitude, max_longitude, max_latitude]",
+        min_length=4,
+        max_length=4,
+        example=[-50.80, -21.72, -50.70, -21.64],
+    )
+
+    @field_validator("bbox")
+    @classmethod
+    def validate_bbox(cls, v: Optional[List[float]]) -> Optional[List[float]]:
+        if v is None:
+            return v
+        min_lon, min_lat, max_lon, max_lat = v
+        if not (-180 <= min_lon < max_lon <= 180):
+            raise ValueError("Longitudes do bbox devem estar entre -180 e 180 e min < max")
+        if not (-90 <= min_lat < max_lat <= 90):
+            raise ValueError("Latitudes do bbox devem estar entre -90 e 90 e min < max")
+        return v
+
+    @model_validator(mode="after")
+    def validate_area(self) -> "AreaFiltro":
+        if (self.geometry is None) == (self.bbox is None):
+            raise ValueError("Informe exatamente um entre 'geometry' e 'bbox'")
+        return self
+
+
+class BuscaAreaRequest(AreaFiltro):
+    """Request schema for area-based search (GeoJSON polygon or bounding box)."""
+
+    page: int = Field(1, description="Número da página (começa em 1)", ge=1, example=1)
+    page_size: int = Field(
+        10, description="Quantidade de resultados por página", ge=1, le=100, example=10
+    )
+
+
+class BuscaAreaResponse(BaseModel):
+    """Response schema for area-based search with pagination."""
+
+    count: int = Field(
+        ..., description="Número total de fazendas encontradas", example=25
+    )
+    page: int = Field(..., description="Página atual", example=1)
+    page_size: int = Field(..., description="Tamanho da página", example=10)
+    total_pages: int = Field(..., description="Total de páginas", example=3)
+    area_km2: float = Field(
+        ..., description="Área aproximada da região de busca em km²", example=91.5
+    )
+    results: List[FazendaSchema] = Field(
+        ..., description="Lista de fazendas encontradas nesta página"
+    )
+
+
+class EstatisticaSchema(BaseModel):
+    """Schema for aggregated farm statistics."""
+
+    cod_estado: str = Field(..., description="Código do estado", example="SP")
+    municipio: Optional[str] = Field(
+        None, description="Município (estatísticas por município)", example="Adamantina"
+    )
+    ind_status: Optional[str] = Field(
+        None, description="Status do imóvel (estatísticas por status)", example="AT"
+    )
+    total_fazendas: int = Field(..., description="Número de fazendas", example=56)
+    area_total: Optional[float] = Field(
+        None, description="Soma de num_area em hectares", example=2150.4
+    )
+    area_mediana: Optional[float] = Field(
+        None, description="Mediana de num_area em hectares", example=12.3
+    )
+
+
+class ClusterSchema(BaseModel):
+    """Schema for a cluster of farms in a map grid cell."""
+
+    latitude: float = Field(
+        ..., description="Latitude média dos centróides do cluster", example=-21.6813
+    )
+    longitude: float = Field(
+        ..., description="Longitude média dos centróides do cluster", example=-50.7479
+    )
+    count: int = Field(..., description="Número de fazendas no cluster", example=12)
+    area_total: Optional[float] = Field(
+        None, description="Soma de num_area em hectares", example=340.2
+    )
+    gid: Optional[int] = Field(
+        None, description="GID da fazenda quando o cluster contém uma única fazenda"
+    )
+
+
+class ClustersResponse(BaseModel):
+    """Response schema for map clustering."""
+
+    zoom: int = Field(..., description="Nível de zoom", example=8)
+    cell_size: float = Field(
+        ..., description="Tamanho da célula da grade em graus", example=0.3515625
+    )
+    bbox: List[float] = Field(
+        ...,
+        description="Bounding box alinhado à grade [min_longitude, min_latitude, max_longitude, max_latitude]",
+    )
+    clusters: List[ClusterSchema] = Field(..., description="Clusters na área")
+
+
+class PosicaoDispositivo(BuscaPontoRequest):
+    """Schema for a device position sent to the geofence WebSocket."""
+
+    device_id: str = Field(
+        ...,
+        description="Identificador do dispositivo",
+        min_length=1,
+        max_length=128,
+        example="trator-42",
+    )
+    timestamp: Optional[str] = Field(
+        None,
+        description="Instante da posição, repetido nos eventos gerados",
+        example="2026-10-18T12:00:00Z",
+    )
+
+
+class JobSchema(BaseModel):
+    """Schema for the status of a bulk point-matching job."""
+
+    id: str = Field(..., description="ID do job")
+    status: str = Field(
+        ..., description="Estado do job: queued, running, completed ou failed"
+    )
+    total: int = Field(..., description="Número de pontos no arquivo enviado")
+    processed: int = Field(..., description="Pontos processados até o momento")
+    matched: int = Field(..., description="Pontos contidos em ao menos uma fazenda")
+    invalid: int = Field(..., description="Linhas com coordenadas inválidas")
+    progress: float = Field(..., description="Fração processada (0 a 1)", example=0.5)
+    created_at: str = Field(..., description="Data de criação (ISO 8601)")
+    started_at: Optional[str] = Field(None, description="Início do processamento")
+    finished_at: Optional[str] = Field(None, description="Fim do processamento")
+    error: Optional[str] = Field(None, description="Mensagem de erro, se houver")
+    result_url: Optional[str] = Field(
+        None, description="URL para download do resultado, quando concluído"
+    )
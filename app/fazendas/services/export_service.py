@@ -0,0 +1,170 @@
+"""Camada de serviço para exportação de fazendas em GeoParquet e Arrow IPC."""
+
+import io
+import json
+import logging
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.fazendas.repositories.fazenda_repository import EXPORT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+FORMATO_PARQUET = "parquet"
+FORMATO_ARROW = "arrow"
+
+MEDIA_TYPES = {
+    FORMATO_PARQUET: "application/vnd.apache.parquet",
+    FORMATO_ARROW: "application/vnd.apache.arrow.stream",
+}
+
+EXTENSOES = {FORMATO_PARQUET: "parquet", FORMATO_ARROW: "arrows"}
+
+# Metadados GeoParquet 1.0: geometria em WKB; sem "crs" vale OGC:CRS84 (lon/lat),
+# equivalente ao SRID 4326 armazenado no banco
+GEO_METADATA = {
+    "version": "1.0.0",
+    "primary_column": "geom",
+    "columns": {
+        "geom": {
+            "encoding": "WKB",
+            "geometry_types": ["MultiPolygon"],
+        }
+    },
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino em memória que acumula os bytes escritos até serem drenados."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Serviço para conversão de resultados de consulta em Arrow."""
+
+    @staticmethod
+    def schema() -> pa.Schema:
+        """
+        Monta o schema Arrow das fazendas exportadas.
+
+        Returns:
+            Schema com gid inteiro, atributos textuais e geometria binária (WKB),
+            com os metadados GeoParquet na chave "geo"
+        """
+        fields = [
+            pa.field("gid", pa.int32(), nullable=False)
+            if name == "gid"
+            else pa.field(name, pa.binary() if name == "geom" else pa.string())
+            for name in EXPORT_COLUMNS
+        ]
+        return pa.schema(fields, metadata={"geo": json.dumps(GEO_METADATA)})
+
+    @staticmethod
+    def record_batch(rows: Sequence[Sequence]) -> pa.RecordBatch:
+        """
+        Converte um lote de linhas do repositório em um RecordBatch.
+
+        Args:
+            rows: Linhas com as colunas de EXPORT_COLUMNS (geometria em WKB)
+
+        Returns:
+            RecordBatch colunar com o schema de exportação
+        """
+        schema = ExportService.schema()
+        columns = list(zip(*rows)) if rows else [[] for _ in EXPORT_COLUMNS]
+
+        arrays = []
+        for field, values in zip(schema, columns):
+            if field.name == "geom":
+                # Alguns drivers devolvem memoryview para bytea
+                values = [bytes(v) if v is not None else None for v in values]
+            arrays.append(pa.array(values, type=field.type))
+
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    @contextmanager
+    def _writer(sink, formato: str):
+        """Abre o writer Arrow IPC (stream) ou Parquet sobre o destino."""
+        schema = ExportService.schema()
+        if formato == FORMATO_ARROW:
+            writer = pa.ipc.new_stream(sink, schema)
+        else:
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+
+        try:
+            yield writer
+        finally:
+            writer.close()
+
+    @staticmethod
+    def stream(batches: Iterable[pa.RecordBatch], formato: str) -> Iterator[bytes]:
+        """
+        Serializa os lotes incrementalmente, entregando os bytes de cada um.
+
+        Cada lote vira uma mensagem IPC ou um row group Parquet, de modo que a
+        resposta começa a ser enviada antes do fim da consulta.
+
+        Args:
+            batches: Lotes a serializar
+            formato: "parquet" (GeoParquet) ou "arrow" (Arrow IPC stream)
+
+        Yields:
+            Trechos do arquivo serializado
+        """
+        sink = _ChunkSink()
+        total = 0
+        with ExportService._writer(sink, formato) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                total += batch.num_rows
+                yield sink.drain()
+
+        # Rodapé do Parquet / marcador de fim do stream IPC
+        yield sink.drain()
+        logger.info(f"Exportação {formato} concluída com {total} fazendas")
+
+    @staticmethod
+    def write_file(
+        batches: Iterable[pa.RecordBatch], path: str, formato: str
+    ) -> int:
+        """
+        Grava os lotes em um arquivo.
+
+        Args:
+            batches: Lotes a gravar
+            path: Caminho do arquivo de saída
+            formato: "parquet" (GeoParquet) ou "arrow" (Arrow IPC stream)
+
+        Returns:
+            Número de fazendas gravadas
+        """
+        total = 0
+        with ExportService._writer(path, formato) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                total += batch.num_rows
+        return total
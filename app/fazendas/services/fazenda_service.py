@@ -1,14 +1,27 @@
 """Camada de serviço para lógica de negócio de Fazenda."""
 
+import hashlib
 import logging
-from typing import Optional
+import math
+from typing import List, Optional
 
 from geoalchemy2.shape import to_shape
+from shapely.geometry import box, shape
+from shapely.geometry.base import BaseGeometry
+from shapely.validation import explain_validity
 
+from app.core.config import get_settings
+from app.core.exceptions import InvalidCoordinatesException
 from app.fazendas.models_sqla import AreaImovel
 
 logger = logging.getLogger(__name__)
 
+# Raio médio da Terra em km, usado no cálculo aproximado de áreas
+EARTH_RADIUS_KM = 6371.0088
+
+# Fração de célula tolerada ao alinhar o bbox dos clusters à grade
+CLUSTER_SNAP_TOLERANCE = 1e-9
+
 
 class FazendaService:
     """Serviço para lógica de negócio de Fazenda."""
@@ -76,3 +89,203 @@ class FazendaService:
             total_count + page_size - 1
         ) // page_size  # Divisão com arredondamento para cima
         return offset, total_pages
+
+    @staticmethod
+    def build_search_area(
+        geometry: Optional[dict], bbox: Optional[List[float]]
+    ) -> tuple[BaseGeometry, float]:
+        """
+        Constrói e valida a geometria de uma busca por área.
+
+        Args:
+            geometry: Geometria GeoJSON (Polygon ou MultiPolygon), ou None
+            bbox: Bounding box [min_lon, min_lat, max_lon, max_lat], ou None
+
+        Returns:
+            Tupla de (geometria shapely, área aproximada em km²)
+
+        Raises:
+            InvalidCoordinatesException: Se a geometria for inválida ou exceder os limites
+        """
+        settings = get_settings()
+
+        if bbox is not None:
+            area = box(*bbox)
+        else:
+            if geometry.get("type") not in ("Polygon", "MultiPolygon"):
+                raise InvalidCoordinatesException(
+                    "Geometria deve ser do tipo Polygon ou MultiPolygon"
+                )
+            try:
+                area = shape(geometry)
+            except Exception as e:
+                raise InvalidCoordinatesException(f"Geometria GeoJSON inválida: {str(e)}")
+
+            vertex_count = FazendaService._count_vertices(area)
+            if vertex_count > settings.AREA_MAX_VERTICES:
+                raise InvalidCoordinatesException(
+                    f"Geometria possui {vertex_count} vértices, "
+                    f"máximo permitido é {settings.AREA_MAX_VERTICES}"
+                )
+
+            if area.is_empty or not area.is_valid:
+                raise InvalidCoordinatesException(
+                    f"Geometria inválida: {explain_validity(area)}"
+                )
+
+            min_lon, min_lat, max_lon, max_lat = area.bounds
+            if not (-180 <= min_lon and max_lon <= 180 and -90 <= min_lat and max_lat <= 90):
+                raise InvalidCoordinatesException(
+                    "Coordenadas da geometria fora dos limites de longitude/latitude"
+                )
+
+        area_km2 = FazendaService.geodesic_area_km2(area)
+        if area_km2 > settings.AREA_MAX_KM2:
+            raise InvalidCoordinatesException(
+                f"Área de busca de {area_km2:.0f} km² excede o máximo de "
+                f"{settings.AREA_MAX_KM2:.0f} km²"
+            )
+
+        return area, area_km2
+
+    @staticmethod
+    def _count_vertices(area: BaseGeometry) -> int:
+        polygons = getattr(area, "geoms", [area])
+        return sum(
+            len(ring.coords)
+            for polygon in polygons
+            for ring in [polygon.exterior, *polygon.interiors]
+        )
+
+    @staticmethod
+    def geodesic_area_km2(area: BaseGeometry) -> float:
+        """
+        Calcula a área aproximada de um polígono em coordenadas WGS84 sobre a esfera.
+
+        Args:
+            area: Polygon ou MultiPolygon em longitude/latitude
+
+        Returns:
+            Área em km²
+        """
+
+        def ring_area(coords) -> float:
+            total = 0.0
+            for (x1, y1), (x2, y2) in zip(coords, coords[1:]):
+                total += math.radians(x2 - x1) * (
+                    2 + math.sin(math.radians(y1)) + math.sin(math.radians(y2))
+                )
+            return abs(total) * EARTH_RADIUS_KM**2 / 2
+
+        polygons = getattr(area, "geoms", [area])
+        return sum(
+            ring_area(polygon.exterior.coords)
+            - sum(ring_area(interior.coords) for interior in polygon.interiors)
+            for polygon in polygons
+        )
+
+    @staticmethod
+    def cluster_grid(
+        bbox: List[float], zoom: int
+    ) -> tuple[float, List[float]]:
+        """
+        Calcula a grade de clusters para um nível de zoom e alinha o bbox a ela.
+
+        O alinhamento faz com que visualizações próximas gerem a mesma consulta,
+        permitindo cache por tile/zoom.
+
+        Args:
+            bbox: Bounding box [min_lon, min_lat, max_lon, max_lat]
+            zoom: Nível de zoom do mapa
+
+        Returns:
+            Tupla de (tamanho da célula em graus, bbox alinhado à grade)
+
+        Raises:
+            InvalidCoordinatesException: Se o bbox gerar células demais
+        """
+        settings = get_settings()
+        cell_size = 360 / (2**zoom * settings.CLUSTER_GRID_CELLS_PER_TILE)
+
+        min_lon, min_lat, max_lon, max_lat = bbox
+        # A tolerância garante que um bbox já alinhado (inclusive após ida e volta
+        # pela URL) seja mantido, em vez de avançar uma célula por erro de ponto flutuante
+        snapped = [
+            max(math.floor(min_lon / cell_size + CLUSTER_SNAP_TOLERANCE) * cell_size, -180.0),
+            max(math.floor(min_lat / cell_size + CLUSTER_SNAP_TOLERANCE) * cell_size, -90.0),
+            min(math.ceil(max_lon / cell_size - CLUSTER_SNAP_TOLERANCE) * cell_size, 180.0),
+            min(math.ceil(max_lat / cell_size - CLUSTER_SNAP_TOLERANCE) * cell_size, 90.0),
+        ]
+
+        cells = round((snapped[2] - snapped[0]) / cell_size) * round(
+            (snapped[3] - snapped[1]) / cell_size
+        )
+        if cells > settings.CLUSTER_MAX_CELLS:
+            raise InvalidCoordinatesException(
+                f"Bounding box gera {cells} células no zoom {zoom}, "
+                f"máximo permitido é {settings.CLUSTER_MAX_CELLS}"
+            )
+
+        return cell_size, snapped
+
+    @staticmethod
+    def serialize_cluster(cluster: dict) -> dict:
+        """
+        Serializa um cluster com a posição média dos centróides das fazendas.
+
+        Args:
+            cluster: Linha agregada retornada pelo repositório
+
+        Returns:
+            Dicionário com coordenadas, contagem e área total do cluster
+        """
+        return {
+            "latitude": float(cluster["latitude"]),
+            "longitude": float(cluster["longitude"]),
+            "count": cluster["count"],
+            "area_total": (
+                float(cluster["area_total"]) if cluster["area_total"] is not None else None
+            ),
+            "gid": cluster["gid"] if cluster["count"] == 1 else None,
+        }
+
+    @staticmethod
+    def etag(*parts) -> str:
+        """
+        Gera um ETag forte a partir das partes que determinam a resposta.
+
+        A versão da API entra no cálculo para que mudanças no formato da resposta
+        invalidem os ETags já emitidos.
+
+        Args:
+            parts: Valores que identificam o conteúdo da resposta
+
+        Returns:
+            ETag entre aspas, pronto para o header
+        """
+        settings = get_settings()
+        source = "|".join(str(part) for part in (settings.API_VERSION, *parts))
+        return f'"{hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """
+        Verifica se o header If-None-Match corresponde ao ETag atual.
+
+        Args:
+            if_none_match: Valor do header If-None-Match (lista de ETags ou "*")
+            etag: ETag atual da resposta
+
+        Returns:
+            True se a resposta em cache do cliente ainda é válida
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+
+        # If-None-Match usa comparação fraca: o prefixo W/ é ignorado
+        candidates = [
+            candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+        ]
+        return etag in candidates
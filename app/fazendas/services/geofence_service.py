@@ -0,0 +1,174 @@
+"""Camada de serviço para detecção de entrada e saída de dispositivos em fazendas."""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import shapely
+from geoalchemy2.shape import to_shape
+from shapely.geometry import Point
+
+from app.fazendas.models_sqla import AreaImovel
+
+logger = logging.getLogger(__name__)
+
+EVENTO_ENTRADA = "enter"
+EVENTO_SAIDA = "exit"
+
+
+@dataclass
+class _Cerca:
+    """Fazenda em que o dispositivo está, com a geometria já preparada."""
+
+    gid: int
+    cod_imovel: Optional[str]
+    geometry: shapely.Geometry
+
+
+@dataclass
+class _Dispositivo:
+    """Estado de um dispositivo: fazendas atuais e a última encontrada."""
+
+    cercas: Dict[int, _Cerca] = field(default_factory=dict)
+    ultima: Optional[int] = None
+    fixes_sem_consulta: int = 0
+
+
+class GeofenceTracker:
+    """
+    Acompanha as posições de dispositivos e gera eventos de entrada e saída.
+
+    Mantém, por dispositivo, as fazendas em que ele está com as geometrias
+    preparadas (shapely.prepare). Cada nova posição é testada primeiro contra a
+    última fazenda encontrada; enquanto o dispositivo continua nela, as demais
+    fazendas atuais são verificadas localmente e o banco não é consultado.
+    Caso contrário, a posição é resolvida pela consulta indexada (lookup).
+
+    Como a verificação local não enxerga fazendas sobrepostas nas quais o
+    dispositivo entre sem sair da última, a consulta indexada é refeita a cada
+    recheck_every posições, limitando o atraso desses eventos.
+
+    Uma instância pertence a uma única conexão e não é thread-safe.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[float, float], List[AreaImovel]],
+        recheck_every: int,
+        max_devices: int,
+    ):
+        """
+        Inicializa o rastreador.
+
+        Args:
+            lookup: Função que retorna as fazendas que contêm (latitude, longitude)
+            recheck_every: Posições resolvidas localmente antes de nova consulta
+            max_devices: Número máximo de dispositivos acompanhados
+        """
+        self.lookup = lookup
+        self.recheck_every = recheck_every
+        self.max_devices = max_devices
+        self._dispositivos: Dict[str, _Dispositivo] = {}
+        self.locais = 0
+        self.consultas = 0
+
+    def _dispositivo(self, device_id: str) -> _Dispositivo:
+        dispositivo = self._dispositivos.get(device_id)
+        if dispositivo is None:
+            if len(self._dispositivos) >= self.max_devices:
+                raise ValueError(
+                    f"Limite de {self.max_devices} dispositivos por conexão atingido"
+                )
+            dispositivo = self._dispositivos[device_id] = _Dispositivo()
+        return dispositivo
+
+    def _consultar(
+        self, dispositivo: _Dispositivo, latitude: float, longitude: float
+    ) -> Dict[int, _Cerca]:
+        """Resolve a posição pela consulta indexada, reaproveitando geometrias já preparadas."""
+        self.consultas += 1
+        cercas = {}
+        for fazenda in self.lookup(latitude, longitude):
+            cerca = dispositivo.cercas.get(fazenda.gid)
+            if cerca is None:
+                geometry = to_shape(fazenda.geom)
+                shapely.prepare(geometry)
+                cerca = _Cerca(fazenda.gid, fazenda.cod_imovel, geometry)
+            cercas[fazenda.gid] = cerca
+        return cercas
+
+    def update(self, device_id: str, latitude: float, longitude: float) -> List[dict]:
+        """
+        Processa uma nova posição de um dispositivo.
+
+        Args:
+            device_id: Identificador do dispositivo
+            latitude: Latitude da posição
+            longitude: Longitude da posição
+
+        Returns:
+            Eventos de saída e de entrada gerados pela posição, nessa ordem
+
+        Raises:
+            ValueError: Se o limite de dispositivos for atingido
+            SQLAlchemyError: Se a consulta indexada falhar
+        """
+        dispositivo = self._dispositivo(device_id)
+        ponto = Point(longitude, latitude)
+
+        ultima = dispositivo.cercas.get(dispositivo.ultima)
+        if (
+            ultima is not None
+            and dispositivo.fixes_sem_consulta < self.recheck_every
+            and ultima.geometry.intersects(ponto)
+        ):
+            self.locais += 1
+            dispositivo.fixes_sem_consulta += 1
+            cercas = {
+                gid: cerca
+                for gid, cerca in dispositivo.cercas.items()
+                if cerca is ultima or cerca.geometry.intersects(ponto)
+            }
+        else:
+            cercas = self._consultar(dispositivo, latitude, longitude)
+            dispositivo.fixes_sem_consulta = 0
+
+        eventos = [
+            self._evento(EVENTO_SAIDA, device_id, cerca, latitude, longitude)
+            for gid, cerca in dispositivo.cercas.items()
+            if gid not in cercas
+        ]
+        novas = [cerca for gid, cerca in cercas.items() if gid not in dispositivo.cercas]
+        eventos.extend(
+            self._evento(EVENTO_ENTRADA, device_id, cerca, latitude, longitude)
+            for cerca in novas
+        )
+
+        dispositivo.cercas = cercas
+        if dispositivo.ultima not in cercas:
+            # Passa a testar primeiro a fazenda em que o dispositivo acabou de entrar
+            candidatas = novas or list(cercas.values())
+            dispositivo.ultima = candidatas[0].gid if candidatas else None
+
+        return eventos
+
+    @staticmethod
+    def _evento(
+        tipo: str, device_id: str, cerca: _Cerca, latitude: float, longitude: float
+    ) -> dict:
+        return {
+            "event": tipo,
+            "device_id": device_id,
+            "gid": cerca.gid,
+            "cod_imovel": cerca.cod_imovel,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+
+    def stats(self) -> dict:
+        """Retorna os contadores de posições resolvidas localmente e por consulta."""
+        return {
+            "devices": len(self._dispositivos),
+            "local": self.locais,
+            "lookups": self.consultas,
+        }
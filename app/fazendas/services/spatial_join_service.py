@@ -0,0 +1,126 @@
+"""Camada de serviço para cruzamento em lote de pontos com fazendas."""
+
+import csv
+import itertools
+import logging
+from collections import defaultdict
+from typing import Callable, Optional
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory, set_statement_timeout
+from app.core.exceptions import InvalidCoordinatesException
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = [
+    "id",
+    "latitude",
+    "longitude",
+    "gid",
+    "cod_imovel",
+    "municipio",
+    "cod_estado",
+    "erro",
+]
+
+
+class SpatialJoinService:
+    """Serviço para jobs de cruzamento de arquivos de pontos com as fazendas."""
+
+    @staticmethod
+    def validate_header(header_line: str) -> None:
+        """
+        Valida o cabeçalho do CSV de pontos.
+
+        Args:
+            header_line: Primeira linha do arquivo
+
+        Raises:
+            InvalidCoordinatesException: Se faltarem as colunas latitude e longitude
+        """
+        columns = {c.strip().lower() for c in next(csv.reader([header_line]), [])}
+        if not {"latitude", "longitude"} <= columns:
+            raise InvalidCoordinatesException(
+                "O CSV deve ter cabeçalho com as colunas 'latitude' e 'longitude'"
+            )
+
+    @staticmethod
+    def _parse_point(row: dict) -> tuple[Optional[tuple[float, float]], Optional[str]]:
+        """Converte uma linha do CSV em (latitude, longitude) ou mensagem de erro."""
+        try:
+            latitude = float(row.get("latitude") or "")
+            longitude = float(row.get("longitude") or "")
+        except ValueError:
+            return None, "Coordenadas não numéricas"
+
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            return None, "Coordenadas fora dos limites"
+        return (latitude, longitude), None
+
+    @staticmethod
+    def process(
+        input_path: str, result_path: str, progress: Callable[..., None]
+    ) -> dict:
+        """
+        Cruza os pontos do arquivo de entrada com as fazendas, em lotes.
+
+        Cada lote de JOBS_CHUNK_SIZE pontos é resolvido com uma única consulta
+        (FazendaRepository.find_by_points) em uma sessão própria, e o progresso
+        é reportado ao fim de cada lote.
+
+        Args:
+            input_path: CSV com cabeçalho contendo latitude, longitude e, opcionalmente, id
+            result_path: CSV de saída, com uma linha por par ponto/fazenda
+            progress: Função que recebe os contadores de progresso
+
+        Returns:
+            Contadores finais (processed, matched, invalid)
+        """
+        settings = get_settings()
+        processed = matched = invalid = 0
+
+        with open(input_path, "r", encoding="utf-8", newline="") as source, open(
+            result_path, "w", encoding="utf-8", newline=""
+        ) as target:
+            reader = csv.DictReader(source)
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            writer = csv.writer(target)
+            writer.writerow(RESULT_COLUMNS)
+
+            while True:
+                chunk = list(itertools.islice(reader, settings.JOBS_CHUNK_SIZE))
+                if not chunk:
+                    break
+
+                parsed = [SpatialJoinService._parse_point(row) for row in chunk]
+                points = [
+                    (idx, point[0], point[1])
+                    for idx, (point, _) in enumerate(parsed)
+                    if point is not None
+                ]
+
+                db = get_session_factory()()
+                try:
+                    set_statement_timeout(db, settings.JOBS_STATEMENT_TIMEOUT_MS)
+                    matches = defaultdict(list)
+                    for idx, *fazenda in FazendaRepository(db).find_by_points(points):
+                        matches[idx].append(fazenda)
+                finally:
+                    db.close()
+
+                for idx, (row, (point, erro)) in enumerate(zip(chunk, parsed)):
+                    row_id = row.get("id") or processed + idx + 1
+                    coords = [row.get("latitude"), row.get("longitude")]
+                    if erro:
+                        writer.writerow([row_id, *coords, None, None, None, None, erro])
+                        continue
+                    for fazenda in matches.get(idx) or [[None] * 4]:
+                        writer.writerow([row_id, *coords, *fazenda, None])
+
+                processed += len(chunk)
+                matched += len(matches)
+                invalid += sum(1 for point, _ in parsed if point is None)
+                progress(processed=processed, matched=matched, invalid=invalid)
+
+        return {"processed": processed, "matched": matched, "invalid": invalid}
@@ -1,21 +1,33 @@
+import time
+
+# Início da importação da aplicação, para medir o tempo de importação
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
 import sys
-import time
 import uuid
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
+from app.core.admission import admission_control
 from app.core.config import get_settings
+from app.core.database import get_engine
 from app.core.exceptions import (
     DatabaseException,
     InvalidCoordinatesException,
     database_exception_handler,
     validation_exception_handler,
 )
+from app.core.health import get_health_prober
+from app.core.jobs import get_job_manager
+from app.core.warmup import warm_up
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+from app.fazendas.routes import geofence_router
 from app.fazendas.routes import router as fazendas_router
 
 # Configura logging
@@ -30,13 +42,43 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _warm_up() -> dict:
+    """Cria o engine e aquece o pool e as consultas do repositório."""
+    return warm_up(
+        get_engine(),
+        connections=settings.DB_POOL_SIZE,
+        prepare=lambda db: FazendaRepository(db).warm_up(),
+        preload=["app.fazendas.services.export_service"],
+        prewarm=settings.DB_PREWARM,
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Eventos do ciclo de vida da aplicação."""
     logger.info("🚀 Starting Fazendas API...")
     logger.info(f"📊 Database: {settings.POSTGRES_DB}")
     logger.info(f"🔧 Pool size: {settings.DB_POOL_SIZE}")
+    logger.info(f"⏱️ Importação levou {IMPORT_TIME_MS:.0f}ms")
+
+    # O aquecimento termina antes de a aplicação aceitar requisições, e antes do
+    # health check, para não misturar as consultas frias às latências medidas
+    app.state.warmup = {}
+    if settings.DB_WARMUP_ENABLED:
+        app.state.warmup = await asyncio.to_thread(_warm_up)
+        logger.info(f"🔥 Aquecimento concluído: {app.state.warmup}")
+
+    await asyncio.to_thread(
+        get_job_manager().start,
+        settings.JOBS_RETENTION_HOURS * 3600,
+        settings.JOBS_CLEANUP_INTERVAL,
+    )
+
+    health_prober = get_health_prober()
+    await health_prober.start()
     yield
+    await health_prober.stop()
+    get_job_manager().shutdown()
     logger.info("👋 Shutting down Fazendas API...")
 
 
@@ -72,6 +114,7 @@ async def add_request_id(request: Request, call_next):
     request.state.request_id = request_id
 
     start_time = time.time()
+    request.state.start_time = start_time
 
     response = await call_next(request)
 
@@ -94,40 +137,63 @@ app.add_exception_handler(DatabaseException, database_exception_handler)
 app.add_exception_handler(InvalidCoordinatesException, validation_exception_handler)
 
 
-# Endpoint de health check
+# Endpoints de health check (servidos a partir do estado em cache do prober)
 @app.get(
     "/health",
     tags=["Health"],
     summary="Health Check",
-    description="Verifica o status da API e conectividade com o banco de dados",
+    description="Verifica o status da API, conectividade com o banco de dados e utilização do pool",
 )
 async def health_check():
     """Endpoint de health check."""
-    from sqlalchemy import text
-
-    from app.core.database import engine
-
-    try:
-        # Testa conexão com banco de dados
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-
-        return {
-            "status": "healthy",
-            "version": settings.API_VERSION,
-            "database": "connected",
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy",
-                "version": settings.API_VERSION,
-                "database": "disconnected",
-                "error": str(e),
-            },
-        )
+    state = get_health_prober().status()
+    connected = state["database"]["status"] == "connected"
+
+    content = {
+        "status": state["status"],
+        "version": settings.API_VERSION,
+        "database": "connected" if connected else "disconnected",
+        "details": state,
+        "startup": {
+            "import_ms": round(IMPORT_TIME_MS, 3),
+            "warmup": getattr(app.state, "warmup", {}),
+        },
+    }
+
+    if state["status"] in ("starting", "unhealthy"):
+        return JSONResponse(status_code=503, content=content)
+    return content
+
+
+@app.get(
+    "/health/live",
+    tags=["Health"],
+    summary="Liveness Check",
+    description="Indica se o processo da API está em execução, sem acessar o banco de dados",
+)
+async def liveness_check():
+    """Endpoint de liveness."""
+    return {"status": "alive", "version": settings.API_VERSION}
+
+
+@app.get(
+    "/health/ready",
+    tags=["Health"],
+    summary="Readiness Check",
+    description="Indica se a API pode receber tráfego (banco conectado e pool não saturado)",
+)
+async def readiness_check():
+    """Endpoint de readiness."""
+    state = get_health_prober().status()
+    content = {
+        "status": "ready" if state["ready"] else "not_ready",
+        "version": settings.API_VERSION,
+        "details": state,
+    }
+
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content=content)
+    return content
 
 
 # Endpoint raiz
@@ -148,4 +214,15 @@ def read_root():
 
 
 # Inclui routers
-app.include_router(fazendas_router, prefix="/fazendas", tags=["Fazendas"])
+app.include_router(
+    fazendas_router,
+    prefix="/fazendas",
+    tags=["Fazendas"],
+    dependencies=[Depends(admission_control)],
+)
+# Conexões WebSocket de longa duração não ocupam o controle de admissão;
+# cada consulta ao banco é admitida individualmente e usa uma sessão própria
+app.include_router(geofence_router, prefix="/fazendas", tags=["Fazendas"])
+
+# Tempo de importação da aplicação (módulos, app e rotas), sem acessar o banco
+IMPORT_TIME_MS = (time.perf_counter() - _IMPORT_STARTED) * 1000
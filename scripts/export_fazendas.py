@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import sys
+
+# Adiciona diretório pai ao path para permitir imports de app/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import ValidationError
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.exceptions import InvalidCoordinatesException
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+from app.fazendas.schemas import AreaFiltro, RaioFiltro
+from app.fazendas.services.export_service import (
+    FORMATO_ARROW,
+    FORMATO_PARQUET,
+    ExportService,
+)
+from app.fazendas.services.fazenda_service import FazendaService
+
+settings = get_settings()
+
+
+class FiltroInvalido(ValueError):
+    """Filtro de exportação rejeitado pelas mesmas validações da API."""
+
+
+def _ler_geojson(path):
+    """Lê a área de um arquivo GeoJSON, aceitando Feature ou geometria pura."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            geometry = json.load(f)
+    except (OSError, ValueError) as e:
+        raise FiltroInvalido(f"Não foi possível ler {path}: {e}")
+    if not isinstance(geometry, dict):
+        raise FiltroInvalido(f"{path} não contém um objeto GeoJSON")
+    return geometry.get("geometry", geometry)
+
+
+def _validar_filtro(raio=None, bbox=None, geometry=None):
+    """
+    Valida o filtro com as regras da API (RaioFiltro, AreaFiltro e build_search_area).
+
+    Returns:
+        Tupla (geometria, área em km²) para filtros por área, ou None para raio
+
+    Raises:
+        FiltroInvalido: Se o filtro for inválido
+    """
+    try:
+        if raio is not None:
+            latitude, longitude, raio_km = raio
+            RaioFiltro(latitude=latitude, longitude=longitude, raio_km=raio_km)
+            return None
+        AreaFiltro(geometry=geometry, bbox=bbox)
+        return FazendaService.build_search_area(geometry, bbox)
+    except ValidationError as e:
+        erro = e.errors()[0]
+        campo = ".".join(map(str, erro["loc"]))
+        raise FiltroInvalido(f"{campo} - {erro['msg']}" if campo else erro["msg"])
+    except InvalidCoordinatesException as e:
+        raise FiltroInvalido(e.detail)
+
+
+def export_fazendas(
+    saida, formato, raio=None, bbox=None, geojson=None, batch_size=None
+):
+    """
+    Exporta fazendas por raio ou área para um arquivo GeoParquet ou Arrow IPC.
+
+    Raises:
+        FiltroInvalido: Se o filtro for inválido (verificado antes de acessar o banco)
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    geometry = _ler_geojson(geojson) if geojson is not None else None
+    area = _validar_filtro(raio, bbox, geometry)
+
+    db = SessionLocal()
+    try:
+        repository = FazendaRepository(db)
+
+        if raio is not None:
+            latitude, longitude, raio_km = raio
+            print(f"Exportando fazendas em raio de {raio_km}km de ({latitude}, {longitude})...")
+            lotes = repository.stream_by_radius(latitude, longitude, raio_km, batch_size)
+        else:
+            area, area_km2 = area
+            print(f"Exportando fazendas em área de {area_km2:.2f}km²...")
+            lotes = repository.stream_by_area(area.wkt, batch_size)
+
+        batches = (ExportService.record_batch(rows) for rows in lotes)
+        total = ExportService.write_file(batches, saida, formato)
+    finally:
+        db.close()
+
+    print(f"{total} fazendas exportadas para {saida}.")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exporta fazendas como GeoParquet ou Arrow IPC stream (geometria em WKB)"
+    )
+    parser.add_argument("saida", help="Arquivo de saída")
+    filtro = parser.add_mutually_exclusive_group(required=True)
+    filtro.add_argument(
+        "--raio",
+        nargs=3,
+        type=float,
+        metavar=("LATITUDE", "LONGITUDE", "RAIO_KM"),
+        help="Exporta as fazendas dentro do raio a partir do ponto",
+    )
+    filtro.add_argument(
+        "--bbox",
+        nargs=4,
+        type=float,
+        metavar=("MIN_LON", "MIN_LAT", "MAX_LON", "MAX_LAT"),
+        help="Exporta as fazendas que intersectam o bounding box",
+    )
+    filtro.add_argument(
+        "--geojson",
+        help="Arquivo GeoJSON (Polygon/MultiPolygon ou Feature) com a área a exportar",
+    )
+    parser.add_argument(
+        "--formato",
+        choices=[FORMATO_PARQUET, FORMATO_ARROW],
+        default=FORMATO_PARQUET,
+        help="Formato do arquivo (padrão: parquet)",
+    )
+    parser.add_argument(
+        "--lote",
+        type=int,
+        default=None,
+        help=f"Linhas por lote (padrão: {settings.EXPORT_BATCH_SIZE})",
+    )
+    args = parser.parse_args()
+
+    try:
+        export_fazendas(
+            args.saida,
+            args.formato,
+            raio=args.raio,
+            bbox=args.bbox,
+            geojson=args.geojson,
+            batch_size=args.lote,
+        )
+    except FiltroInvalido as e:
+        parser.error(str(e))
@@ -0,0 +1,239 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+# Adiciona diretório pai ao path para permitir imports de app/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal, engine
+from app.fazendas.models_sqla import AreaImovel
+from app.fazendas.repositories.estatisticas_repository import EstatisticasRepository
+
+STAGING_TABLE = "staging_area_imovel"
+COLUMNS = [column.name for column in AreaImovel.__table__.columns]
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Coluna opcional do delta que marca registros excluídos na origem (true/false)
+TOMBSTONE_COLUMN = "removido"
+
+# Coluna que decide se um registro existente mudou; obrigatória para inserir ou atualizar
+VERSION_COLUMN = "dat_atuali"
+
+settings = get_settings()
+
+# Na tabela particionada a chave primária inclui a chave de partição
+KEY_COLUMNS = ["gid", "cod_estado"] if settings.DB_PARTITION_BY_ESTADO else ["gid"]
+
+
+def _read_source(path):
+    """Retorna (colunas, stream CSV sem cabeçalho) a partir de um arquivo CSV ou JSON."""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            writer.writerow(
+                [record.get(column) for column in COLUMNS]
+                + [bool(record.get(TOMBSTONE_COLUMN, False))]
+            )
+        buffer.seek(0)
+        return COLUMNS + [TOMBSTONE_COLUMN], buffer
+
+    # CSV com cabeçalho: o restante do arquivo é enviado diretamente ao COPY
+    stream = open(path, "r", encoding="utf-8", newline="")
+    columns = next(csv.reader([stream.readline()]))
+    return columns, stream
+
+
+def _copy(cursor, sql, stream):
+    """Executa COPY FROM STDIN com psycopg 3 (ou psycopg2, se configurado)."""
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, stream)
+        return
+
+    with cursor.copy(sql) as copy:
+        while True:
+            data = stream.read(COPY_CHUNK_SIZE)
+            if not data:
+                break
+            copy.write(data)
+
+
+def ingest_delta(path, delete_missing=False):
+    """
+    Aplica um delta de fazendas em area_imovel_1.
+
+    Registros novos são inseridos e os existentes só são atualizados quando
+    dat_atuali muda. Remoções acontecem apenas para registros marcados na
+    coluna "removido" do arquivo ou, com delete_missing, para os registros
+    ausentes do arquivo nos estados presentes nele (o arquivo deve então ser
+    um snapshot completo desses estados).
+    """
+    if settings.is_spatialite:
+        # COPY, ON CONFLICT, xmax e REFRESH ... CONCURRENTLY são do PostgreSQL
+        print("A carga incremental requer o backend PostgreSQL/PostGIS.")
+        sys.exit(1)
+
+    print(f"Carregando delta de {path}...")
+
+    columns, stream = _read_source(path)
+
+    unknown = set(columns) - set(COLUMNS) - {TOMBSTONE_COLUMN}
+    missing = set(KEY_COLUMNS) - set(columns)
+    if unknown or missing:
+        stream.close()
+        raise ValueError(
+            f"Colunas inválidas no arquivo: desconhecidas={sorted(unknown)}, "
+            f"ausentes={sorted(missing)}"
+        )
+
+    data_columns = [column for column in columns if column != TOMBSTONE_COLUMN]
+    column_list = ", ".join(data_columns)
+    # Geometrias em WKB sem SRID são associadas ao SRID 4326
+    select_list = ", ".join(
+        "ST_Multi(CASE WHEN ST_SRID(geom) = 0 THEN ST_SetSRID(geom, 4326) ELSE geom END)"
+        if column == "geom"
+        else column
+        for column in data_columns
+    )
+    key_list = ", ".join(KEY_COLUMNS)
+    update_list = ", ".join(
+        f"{column} = EXCLUDED.{column}"
+        for column in data_columns
+        if column not in KEY_COLUMNS
+    )
+    key_match = " AND ".join(f"s.{column} = a.{column}" for column in KEY_COLUMNS)
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+
+        cursor.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} "
+            f"(LIKE {AreaImovel.__tablename__} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE} ALTER COLUMN geom TYPE geometry")
+        cursor.execute(
+            f"ALTER TABLE {STAGING_TABLE} "
+            f"ADD COLUMN {TOMBSTONE_COLUMN} boolean NOT NULL DEFAULT false"
+        )
+
+        _copy(
+            cursor,
+            f"COPY {STAGING_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            stream,
+        )
+        cursor.execute(f"ANALYZE {STAGING_TABLE}")
+
+        cursor.execute(
+            f"SELECT count(*), count(*) FILTER (WHERE NOT {TOMBSTONE_COLUMN}) "
+            f"FROM {STAGING_TABLE}"
+        )
+        staged, upserts = cursor.fetchone()
+        print(f"{staged} registros carregados na tabela de staging.")
+
+        if upserts and VERSION_COLUMN not in columns:
+            # Sem dat_atuali, EXCLUDED.dat_atuali é NULL e todo registro existente
+            # seria regravado, disparando os triggers de versão e de subdivisão
+            raise ValueError(
+                f"O arquivo deve ter a coluna {VERSION_COLUMN} para inserir ou atualizar "
+                f"registros; sem ela, apenas remoções (coluna {TOMBSTONE_COLUMN}) são aceitas"
+            )
+
+        # Insere novos registros e atualiza apenas os que mudaram de dat_atuali
+        cursor.execute(
+            f"""
+            WITH upserted AS (
+                INSERT INTO {AreaImovel.__tablename__} ({column_list})
+                SELECT DISTINCT ON ({key_list}) {select_list}
+                FROM {STAGING_TABLE}
+                WHERE NOT {TOMBSTONE_COLUMN}
+                ORDER BY {key_list}
+                ON CONFLICT ({key_list}) DO UPDATE SET {update_list}
+                WHERE {AreaImovel.__tablename__}.dat_atuali IS DISTINCT FROM EXCLUDED.dat_atuali
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+            FROM upserted
+            """
+        )
+        inserted, updated = cursor.fetchone()
+
+        # Remove os registros marcados como removidos na origem
+        cursor.execute(
+            f"""
+            WITH removed AS (
+                DELETE FROM {AreaImovel.__tablename__} a
+                USING {STAGING_TABLE} s
+                WHERE s.{TOMBSTONE_COLUMN} AND {key_match}
+                RETURNING 1
+            )
+            SELECT count(*) FROM removed
+            """
+        )
+        deleted = cursor.fetchone()[0]
+
+        if delete_missing:
+            # Snapshot completo: remove registros ausentes do arquivo, apenas
+            # nos estados presentes nele
+            cursor.execute(
+                f"""
+                WITH removed AS (
+                    DELETE FROM {AreaImovel.__tablename__} a
+                    WHERE a.cod_estado IN (
+                          SELECT DISTINCT cod_estado FROM {STAGING_TABLE}
+                          WHERE NOT {TOMBSTONE_COLUMN}
+                      )
+                      AND NOT EXISTS (
+                          SELECT 1 FROM {STAGING_TABLE} s
+                          WHERE {key_match} AND NOT s.{TOMBSTONE_COLUMN}
+                      )
+                    RETURNING 1
+                )
+                SELECT count(*) FROM removed
+                """
+            )
+            deleted += cursor.fetchone()[0]
+
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Erro ao carregar delta: {e}")
+        raise
+    finally:
+        stream.close()
+        connection.close()
+
+    print(f"Inseridos: {inserted}, atualizados: {updated}, removidos: {deleted}.")
+
+    if inserted or updated or deleted:
+        db = SessionLocal()
+        try:
+            EstatisticasRepository(db).refresh()
+            print("Estatísticas atualizadas.")
+        finally:
+            db.close()
+
+    return {"inserted": inserted, "updated": updated, "deleted": deleted}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Carga incremental de fazendas (CSV ou JSON no formato de seeds.json)"
+    )
+    parser.add_argument("arquivo", help="Arquivo de delta (.csv com cabeçalho ou .json)")
+    parser.add_argument(
+        "--remover-ausentes",
+        action="store_true",
+        help="Trata o arquivo como snapshot completo dos estados presentes nele e "
+        "remove os registros desses estados que não estão no arquivo",
+    )
+    args = parser.parse_args()
+
+    ingest_delta(args.arquivo, delete_missing=args.remover_ausentes)
@@ -7,8 +7,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from geoalchemy2 import WKTElement
 
+from app.core.config import get_settings
 from app.core.database import SessionLocal
 from app.fazendas.models_sqla import AreaImovel
+from app.fazendas.repositories.estatisticas_repository import EstatisticasRepository
+
+settings = get_settings()
 
 
 def load_seeds():
@@ -59,6 +63,12 @@ def load_seeds():
 
         db.commit()
         print(f"Carregados com sucesso {len(seeds)} registros de seed.")
+
+        # Atualiza as estatísticas agregadas com os novos registros (as views
+        # materializadas só existem no PostgreSQL)
+        if not settings.is_spatialite:
+            EstatisticasRepository(db).refresh()
+            print("Estatísticas atualizadas.")
     except Exception as e:
         db.rollback()
         print(f"Erro ao carregar seeds: {e}")
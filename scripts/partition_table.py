@@ -0,0 +1,96 @@
+import os
+import sys
+
+# Adiciona diretório pai ao path para permitir imports de app/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.fazendas.models_sqla import (
+    ESTATISTICAS_VIEWS,
+    SUBDIVISAO_TRIGGER_DDL,
+    VERSAO_TRIGGER_DDL,
+    AreaImovel,
+    estatisticas_view_ddl,
+)
+
+TABLE = AreaImovel.__tablename__
+OLD_TABLE = f"{TABLE}_unpartitioned"
+COLUMNS = [column.name for column in AreaImovel.__table__.columns]
+
+
+def partition_table():
+    """Migra area_imovel_1 para uma tabela particionada por cod_estado."""
+    if get_settings().is_spatialite:
+        print("O particionamento requer o backend PostgreSQL/PostGIS.")
+        sys.exit(1)
+
+    if not get_settings().DB_PARTITION_BY_ESTADO:
+        print("Defina DB_PARTITION_BY_ESTADO=1 antes de executar a migração.")
+        sys.exit(1)
+
+    with engine.begin() as conn:
+        relkind = conn.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = :table"),
+            {"table": TABLE},
+        ).scalar()
+
+        if relkind == "p":
+            print(f"Tabela {TABLE} já está particionada. Nada a fazer.")
+            return
+        if relkind is None:
+            print(f"Tabela {TABLE} não existe. Execute scripts/create_tables.py.")
+            return
+
+        print("Removendo views materializadas dependentes...")
+        for view in ESTATISTICAS_VIEWS:
+            conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {view}"))
+
+        print(f"Renomeando {TABLE} para {OLD_TABLE}...")
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_area_imovel_1_subdividir ON {TABLE}"))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_area_imovel_1_versionar ON {TABLE}"))
+        conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}"))
+
+        # Libera os nomes dos índices para a nova tabela
+        indexes = conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+            {"table": OLD_TABLE},
+        ).scalars()
+        for index in list(indexes):
+            conn.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index[:50]}_unpartitioned"'))
+
+        print(f"Criando {TABLE} particionada por cod_estado...")
+        AreaImovel.__table__.create(bind=conn)
+
+        print("Copiando registros...")
+        column_list = ", ".join(COLUMNS)
+        select_list = ", ".join(
+            "COALESCE(cod_estado, '')" if column == "cod_estado" else column
+            for column in COLUMNS
+        )
+        copied = conn.execute(
+            text(f"INSERT INTO {TABLE} ({column_list}) SELECT {select_list} FROM {OLD_TABLE}")
+        ).rowcount
+        print(f"{copied} registros copiados.")
+
+        # As geometrias subdivididas continuam válidas; apenas os triggers são recriados
+        conn.exec_driver_sql(SUBDIVISAO_TRIGGER_DDL)
+        conn.exec_driver_sql(VERSAO_TRIGGER_DDL)
+
+        print("Recriando views materializadas...")
+        for view, columns in ESTATISTICAS_VIEWS.items():
+            conn.exec_driver_sql(estatisticas_view_ddl(view, columns))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ANALYZE {TABLE}"))
+
+    print(
+        f"Migração concluída. Após validar os dados, remova a tabela antiga com "
+        f"'DROP TABLE {OLD_TABLE};'."
+    )
+
+
+if __name__ == "__main__":
+    partition_table()
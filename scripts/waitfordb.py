@@ -2,7 +2,7 @@ import os
 import sys
 import time
 
-import psycopg2
+import psycopg
 
 
 def waitforpostgres():
@@ -14,13 +14,13 @@ def waitforpostgres():
 
     while True:
         try:
-            conn = psycopg2.connect(
+            conn = psycopg.connect(
                 dbname=dbname, user=user, password=password, host=host, port=port
             )
             conn.close()
             print("PostgreSQL is ready!")
             break
-        except psycopg2.OperationalError as e:
+        except psycopg.OperationalError as e:
             print(f"Waiting for PostgreSQL... {e}")
             time.sleep(1)
 
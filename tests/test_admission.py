@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import WeightedLimiter
+from app.core.exceptions import ServiceOverloadedException
+
+
+def test_admits_within_capacity():
+    async def scenario():
+        limiter = WeightedLimiter(capacity=3, max_queue=1, max_wait=0.1)
+        await limiter.acquire(2)
+        await limiter.acquire(1)
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["in_use"] == 3
+    assert stats["admitted"] == 2
+
+
+def test_queued_request_admitted_after_release():
+    async def scenario():
+        limiter = WeightedLimiter(capacity=2, max_queue=1, max_wait=1.0)
+        await limiter.acquire(2)
+        waiter = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0.01)
+        assert limiter.stats()["queued"] == 1
+        limiter.release(2)
+        await waiter
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["in_use"] == 1
+    assert stats["queued"] == 0
+
+
+def test_rejects_when_queue_full():
+    async def scenario():
+        limiter = WeightedLimiter(capacity=1, max_queue=1, max_wait=1.0)
+        await limiter.acquire(1)
+        waiter = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(ServiceOverloadedException) as exc_info:
+                await limiter.acquire(1)
+        finally:
+            waiter.cancel()
+        return exc_info.value
+
+    exc = asyncio.run(scenario())
+    assert exc.status_code == 503
+    assert "Retry-After" in exc.headers
+
+
+def test_rejects_after_max_wait():
+    async def scenario():
+        limiter = WeightedLimiter(capacity=1, max_queue=5, max_wait=0.05)
+        await limiter.acquire(1)
+        with pytest.raises(ServiceOverloadedException):
+            await limiter.acquire(1)
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["queued"] == 0
+    assert stats["rejected"] == 1
@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from app.core.config import get_settings
+from app.core.database import (
+    QueryCanceller,
+    database_error,
+    is_query_cancelled,
+    statement_timeout_ms,
+)
+from app.core.exceptions import DatabaseException, QueryTimeoutException
+from main import app
+
+settings = get_settings()
+
+# Consulta que só termina se for interrompida
+SLOW_QUERY = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) FROM n"
+)
+
+
+def make_request(route_name=None, deadline=None, start_time=None):
+    headers = []
+    if deadline is not None:
+        headers.append((settings.REQUEST_DEADLINE_HEADER.lower().encode(), deadline.encode()))
+    scope = {
+        "type": "http",
+        "headers": headers,
+        "route": SimpleNamespace(name=route_name),
+        "state": {},
+    }
+    request = Request(scope)
+    if start_time is not None:
+        request.state.start_time = start_time
+    return request
+
+
+def test_timeout_per_route():
+    assert statement_timeout_ms(make_request("busca_raio")) == settings.DB_STATEMENT_TIMEOUTS["busca_raio"]
+    assert statement_timeout_ms(make_request("sem_configuracao")) == settings.DB_STATEMENT_TIMEOUT_MS
+
+
+def test_deadline_clamps_timeout():
+    timeout = statement_timeout_ms(make_request("busca_raio", deadline="100", start_time=time.time()))
+    assert 0 < timeout <= 100
+
+    # Um prazo maior que o timeout da rota não o amplia
+    timeout = statement_timeout_ms(make_request("busca_raio", deadline="999999999"))
+    assert timeout == settings.DB_STATEMENT_TIMEOUTS["busca_raio"]
+
+
+def test_invalid_deadline_is_ignored():
+    timeout = statement_timeout_ms(make_request("busca_raio", deadline="abc"))
+    assert timeout == settings.DB_STATEMENT_TIMEOUTS["busca_raio"]
+
+
+def test_expired_deadline():
+    with pytest.raises(QueryTimeoutException):
+        statement_timeout_ms(make_request("busca_raio", deadline="50", start_time=time.time() - 1))
+
+
+def test_expired_deadline_returns_504_without_database():
+    response = TestClient(app).get(
+        "/fazendas/1", headers={settings.REQUEST_DEADLINE_HEADER: "0"}
+    )
+    assert response.status_code == 504
+
+
+def test_canceller_interrupts_sqlite_query():
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    canceller = QueryCanceller()
+    canceller.attach(connection)
+    errors = []
+
+    def run():
+        try:
+            connection.execute(SLOW_QUERY).fetchall()
+        except sqlite3.OperationalError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.1)
+    canceller.cancel()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert canceller.cancelled
+    assert str(errors[0]) == "interrupted"
+
+
+def test_canceller_detached_does_nothing():
+    canceller = QueryCanceller()
+    canceller.attach(sqlite3.connect(":memory:"))
+    canceller.detach()
+    canceller.cancel()
+    assert not canceller.cancelled
+
+
+def test_cancelled_query_maps_to_504():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    with engine.connect() as conn:
+        canceller = QueryCanceller()
+        canceller.attach(conn.connection.dbapi_connection)
+        timer = threading.Timer(0.1, canceller.cancel)
+        timer.start()
+        with pytest.raises(OperationalError) as exc_info:
+            conn.execute(text(SLOW_QUERY))
+        timer.join()
+
+    assert is_query_cancelled(exc_info.value)
+    assert isinstance(database_error(exc_info.value, "no teste"), QueryTimeoutException)
+
+
+def test_other_database_errors_map_to_500():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn, pytest.raises(OperationalError) as exc_info:
+        conn.execute(text("SELECT * FROM tabela_inexistente"))
+
+    assert not is_query_cancelled(exc_info.value)
+    error = database_error(exc_info.value, "no teste", "Falhou")
+    assert isinstance(error, DatabaseException)
+    assert error.detail == "Falhou"
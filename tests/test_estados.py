@@ -0,0 +1,107 @@
+import math
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.fazendas.estados import (
+    ESTADOS_BBOX,
+    KM_POR_GRAU,
+    MARGEM_GRAUS,
+    bbox_do_raio,
+    estados_no_bbox,
+)
+from app.fazendas.models_sqla import PARTICOES_ESTADO_DDL, AreaImovel
+from app.fazendas.repositories import fazenda_repository
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+
+
+def test_point_inside_state():
+    # Centro de Adamantina/SP
+    assert "SP" in estados_no_bbox(-51.07, -21.68, -51.07, -21.68)
+
+
+def test_bbox_boundary_includes_margin():
+    min_lon, min_lat, max_lon, max_lat = ESTADOS_BBOX["SP"]
+
+    # Exatamente na borda do bbox com margem: incluído
+    edge = max_lon + MARGEM_GRAUS
+    assert "SP" in estados_no_bbox(edge, -22.0, edge + 1, -21.0)
+
+    # Logo além da margem: excluído
+    beyond = max_lon + MARGEM_GRAUS + 1e-6
+    assert "SP" not in estados_no_bbox(beyond, -22.0, beyond + 1, -21.0)
+
+
+def test_bbox_outside_brazil():
+    assert estados_no_bbox(10.0, 40.0, 11.0, 41.0) == []
+
+
+def test_whole_world_returns_every_state():
+    assert sorted(estados_no_bbox(-180, -90, 180, 90)) == sorted(ESTADOS_BBOX)
+
+
+def test_radius_bbox_contains_circle():
+    latitude, longitude, radius_km = -21.68, -51.07, 50
+    min_lon, min_lat, max_lon, max_lat = bbox_do_raio(latitude, longitude, radius_km)
+
+    assert max_lat - latitude >= radius_km / KM_POR_GRAU
+    assert latitude - min_lat >= radius_km / KM_POR_GRAU
+    # Um grau de longitude encolhe com a latitude: o bbox é mais largo que alto
+    lon_km = (max_lon - longitude) * KM_POR_GRAU * math.cos(math.radians(latitude))
+    assert lon_km >= radius_km
+
+
+def test_radius_bbox_clamped_at_pole():
+    min_lon, min_lat, max_lon, max_lat = bbox_do_raio(89.9, 10.0, 50)
+    assert max_lat == 90.0
+    # Próximo ao polo o círculo cobre todas as longitudes
+    assert (min_lon, max_lon) == (-180.0, 180.0)
+    assert min_lat < 89.9
+
+
+def test_radius_bbox_clamped_at_antimeridian():
+    min_lon, _, max_lon, _ = bbox_do_raio(0.0, 179.9, 50)
+    assert max_lon == 180.0
+    assert min_lon < 179.9
+
+    min_lon, _, max_lon, _ = bbox_do_raio(0.0, -179.9, 50)
+    assert min_lon == -180.0
+
+
+def test_partition_ddl_has_one_partition_per_state_and_default():
+    statements = [line for line in PARTICOES_ESTADO_DDL.splitlines() if line]
+    assert len(statements) == len(ESTADOS_BBOX) + 1
+    assert "PARTITION OF area_imovel_1 FOR VALUES IN ('SP')" in PARTICOES_ESTADO_DDL
+    assert statements[-1].endswith("PARTITION OF area_imovel_1 DEFAULT;")
+
+
+@pytest.fixture
+def estados_db(monkeypatch):
+    """Tabela mínima com gid e cod_estado para avaliar o filtro de estados."""
+    monkeypatch.setattr(fazenda_repository.settings, "DB_PARTITION_BY_ESTADO", True)
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE area_imovel_1 (gid INTEGER, cod_estado TEXT)"))
+        conn.execute(
+            text(
+                "INSERT INTO area_imovel_1 VALUES "
+                "(1, 'SP'), (2, 'RS'), (3, ''), (4, 'XX'), (5, NULL)"
+            )
+        )
+    return engine
+
+
+def test_state_filter_keeps_unknown_states(estados_db):
+    criteria = FazendaRepository._filtro_estados(-51.1, -21.7, -51.0, -21.6)
+    with estados_db.connect() as conn:
+        gids = conn.execute(
+            select(AreaImovel.gid).where(*criteria).order_by(AreaImovel.gid)
+        ).scalars().all()
+
+    # SP pelo bbox; vazia, desconhecida e nula pela partição padrão; RS podada
+    assert gids == [1, 3, 4, 5]
+
+
+def test_state_filter_disabled_without_partitioning(monkeypatch):
+    monkeypatch.setattr(fazenda_repository.settings, "DB_PARTITION_BY_ESTADO", False)
+    assert FazendaRepository._filtro_estados(-51.1, -21.7, -51.0, -21.6) == []
@@ -0,0 +1,35 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.fazendas.repositories import fazenda_repository
+from app.fazendas.schemas import BuscaPontoRequest
+from app.fazendas.services.fazenda_service import FazendaService
+from main import app
+
+
+def test_etag_matching():
+    etag = FazendaService.etag("busca_ponto", 1, "{}")
+    assert FazendaService.etag_matches(etag, etag)
+    assert FazendaService.etag_matches(f'W/{etag}, "outro"', etag)
+    assert FazendaService.etag_matches("*", etag)
+    assert not FazendaService.etag_matches('"outro"', etag)
+    assert not FazendaService.etag_matches(None, etag)
+
+
+def test_search_not_modified_without_database_connection(monkeypatch):
+    # Com a versão da tabela em cache, o 304 é decidido sem obter conexão do pool:
+    # sem banco disponível, qualquer tentativa de conexão resultaria em erro
+    monkeypatch.setattr(app, "dependency_overrides", {})
+    monkeypatch.setattr(fazenda_repository, "_versao_cache", (7, time.monotonic() + 60))
+
+    body = {"latitude": 0, "longitude": 0}
+    etag = FazendaService.etag(
+        "busca_ponto", 7, BuscaPontoRequest(**body).model_dump_json()
+    )
+
+    response = TestClient(app).post(
+        "/fazendas/busca-ponto", json=body, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from scripts.export_fazendas import FiltroInvalido, _validar_filtro, export_fazendas
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    "bbox, mensagem",
+    [
+        ([10, 0, 5, 1], "Longitudes"),
+        ([0, -95, 1, 1], "Latitudes"),
+        ([0, 0, 1, 0], "Latitudes"),
+    ],
+)
+def test_invalid_bbox_rejected_before_database(tmp_path, bbox, mensagem):
+    with pytest.raises(FiltroInvalido, match=mensagem):
+        export_fazendas(str(tmp_path / "saida.parquet"), "parquet", bbox=bbox)
+
+
+def test_filters_follow_api_rules(tmp_path):
+    area, area_km2 = _validar_filtro(bbox=[0, 0, 1, 1])
+    assert area.bounds == (0, 0, 1, 1)
+    assert area_km2 > 0
+    assert _validar_filtro(raio=[0, 0, 10]) is None
+
+    with pytest.raises(FiltroInvalido, match="raio_km"):
+        _validar_filtro(raio=[0, 0, 5000])
+    with pytest.raises(FiltroInvalido, match="Polygon"):
+        _validar_filtro(geometry={"type": "Point", "coordinates": [0, 0]})
+
+    geojson = tmp_path / "area.json"
+    geojson.write_text("{")
+    with pytest.raises(FiltroInvalido):
+        export_fazendas(str(tmp_path / "saida.parquet"), "parquet", geojson=str(geojson))
+
+
+def test_cli_reports_invalid_bbox_as_usage_error(tmp_path):
+    result = subprocess.run(
+        [
+            sys.executable,
+            os.path.join("scripts", "export_fazendas.py"),
+            str(tmp_path / "saida.parquet"),
+            "--bbox",
+            "10",
+            "0",
+            "5",
+            "1",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2
+    assert "Longitudes do bbox" in result.stderr
+    assert "Traceback" not in result.stderr
@@ -1,18 +1,22 @@
 import pytest
 from fastapi.testclient import TestClient
 from geoalchemy2 import WKTElement
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
-from app.core.database import Base, get_db
-from app.fazendas.models_sqla import AreaImovel
+from app.core.database import Base, engine, get_db
+from app.fazendas.models_sqla import AreaImovel, AreaImovelSubdividida
+from app.fazendas.repositories.estatisticas_repository import EstatisticasRepository
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
 from main import app
 
 settings = get_settings()
-engine = create_engine(settings.database_url)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+postgresql_only = pytest.mark.skipif(
+    settings.is_spatialite, reason="Requires the PostgreSQL/PostGIS backend"
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
@@ -81,6 +85,49 @@ def test_busca_ponto_success(client, fazenda):
     assert results[0]["gid"] == fazenda.gid
 
 
+def test_busca_ponto_on_boundary(client, fazenda):
+    # Pontos na borda pertencem à fazenda nos dois backends (ST_Intersects)
+    response = client.post("/fazendas/busca-ponto", json={"latitude": 0, "longitude": 1})
+    assert response.status_code == 200
+    assert [f["gid"] for f in response.json()] == [fazenda.gid]
+
+
+def test_find_by_points(db_session, fazenda):
+    points = [(0, 0.0, 0.0), (1, 5.0, 5.0), (2, 0.0, 1.0)]
+    rows = sorted(FazendaRepository(db_session).find_by_points(points))
+    assert [(idx, gid, cod_imovel) for idx, gid, cod_imovel, *_ in rows] == [
+        (0, fazenda.gid, "CODE123"),
+        (2, fazenda.gid, "CODE123"),
+    ]
+    assert FazendaRepository(db_session).find_by_points([]) == []
+
+
+def test_get_fazenda_etag_not_modified(client, fazenda):
+    response = client.get(f"/fazendas/{fazenda.gid}")
+    etag = response.headers["etag"]
+
+    response = client.get(f"/fazendas/{fazenda.gid}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_busca_ponto_etag_not_modified(client, fazenda):
+    data = {"latitude": 0, "longitude": 0}
+    etag = client.post("/fazendas/busca-ponto", json=data).headers["etag"]
+
+    response = client.post(
+        "/fazendas/busca-ponto", json=data, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = client.post(
+        "/fazendas/busca-ponto", json={"latitude": 0.5, "longitude": 0.5},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+
+
 def test_busca_raio_success(client, fazenda):
     # Point very close to center (0,0)
     data = {"latitude": 0.0001, "longitude": 0.0001, "raio_km": 1}
@@ -89,3 +136,167 @@ def test_busca_raio_success(client, fazenda):
     data_res = response.json()
     assert data_res["count"] >= 1
     assert data_res["results"][0]["gid"] == fazenda.gid
+
+
+def test_busca_area_bbox(client, fazenda):
+    data = {"bbox": [-0.5, -0.5, 0.5, 0.5]}
+    response = client.post("/fazendas/busca-area", json=data)
+    assert response.status_code == 200
+    data_res = response.json()
+    assert data_res["count"] >= 1
+    assert fazenda.gid in [f["gid"] for f in data_res["results"]]
+
+
+def test_busca_area_polygon(client, fazenda):
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[[0.5, 0.5], [2, 0.5], [2, 2], [0.5, 2], [0.5, 0.5]]],
+    }
+    response = client.post("/fazendas/busca-area", json={"geometry": polygon})
+    assert response.status_code == 200
+    assert fazenda.gid in [f["gid"] for f in response.json()["results"]]
+
+
+def test_busca_area_too_many_vertices(client, db_session):
+    ring = [[0.001 * i, 0] for i in range(1001)] + [[1, 1], [0, 0]]
+    polygon = {"type": "Polygon", "coordinates": [ring]}
+    response = client.post("/fazendas/busca-area", json={"geometry": polygon})
+    assert response.status_code == 400
+
+
+def test_busca_area_requires_single_input(client, db_session):
+    response = client.post("/fazendas/busca-area", json={})
+    assert response.status_code == 422
+
+
+@postgresql_only
+def test_subdivided_geometry_maintained(db_session, fazenda):
+    pieces = db_session.query(AreaImovelSubdividida).filter_by(gid=fazenda.gid).count()
+    assert pieces >= 1
+
+    db_session.delete(fazenda)
+    db_session.commit()
+    pieces = db_session.query(AreaImovelSubdividida).filter_by(gid=fazenda.gid).count()
+    assert pieces == 0
+
+
+@pytest.fixture
+def fazendas_estatisticas(db_session):
+    # Estados fictícios para não colidir com dados já carregados no banco
+    poly_wkt = "MULTIPOLYGON(((10 10, 11 10, 11 11, 10 11, 10 10)))"
+    seeds = [
+        (9101, "XA", "Municipio A", "10.5"),
+        (9102, "XA", "Municipio A", "20.5"),
+        (9103, "XA", "Municipio B", "5"),
+        (9104, "XB", "Municipio C", "n/d"),
+    ]
+    for gid, cod_estado, municipio, num_area in seeds:
+        db_session.add(
+            AreaImovel(
+                gid=gid,
+                cod_estado=cod_estado,
+                municipio=municipio,
+                num_area=num_area,
+                geom=WKTElement(poly_wkt, srid=4326),
+            )
+        )
+    db_session.commit()
+    EstatisticasRepository(db_session).refresh()
+
+
+@postgresql_only
+def test_estatisticas_estados(client, fazendas_estatisticas):
+    response = client.get("/fazendas/estatisticas/estados")
+    assert response.status_code == 200
+    rows = {row["cod_estado"]: row for row in response.json()}
+    assert rows["XA"]["total_fazendas"] == 3
+    assert rows["XA"]["area_total"] == 36.0
+    assert rows["XB"]["total_fazendas"] == 1
+    # num_area não numérico fica fora da soma
+    assert rows["XB"]["area_total"] is None
+
+
+@postgresql_only
+def test_estatisticas_municipios_filtro_estado(client, fazendas_estatisticas):
+    response = client.get("/fazendas/estatisticas/municipios", params={"cod_estado": "XA"})
+    assert response.status_code == 200
+    rows = {row["municipio"]: row["total_fazendas"] for row in response.json()}
+    assert rows == {"Municipio A": 2, "Municipio B": 1}
+
+
+@postgresql_only
+def test_mapa_clusters(client, fazenda):
+    params = {
+        "min_longitude": -2,
+        "min_latitude": -2,
+        "max_longitude": 2,
+        "max_latitude": 2,
+        "zoom": 6,
+    }
+    response = client.get("/fazendas/mapa/clusters", params=params)
+    assert response.status_code == 200
+    assert "max-age" in response.headers["Cache-Control"]
+    clusters = response.json()["clusters"]
+    assert sum(c["count"] for c in clusters) >= 1
+
+
+@postgresql_only
+def test_mapa_clusters_redirects_to_snapped_bbox(client, fazenda):
+    params = {
+        "min_longitude": -2,
+        "min_latitude": -2,
+        "max_longitude": 2,
+        "max_latitude": 2,
+        "zoom": 6,
+    }
+    response = client.get("/fazendas/mapa/clusters", params=params, follow_redirects=False)
+    assert response.status_code == 307
+    assert "max-age" in response.headers["Cache-Control"]
+
+    # A URL alinhada é servida diretamente, sem novo redirecionamento
+    response = client.get(response.headers["location"], follow_redirects=False)
+    assert response.status_code == 200
+    assert response.json()["bbox"] == [-2.8125, -2.8125, 2.8125, 2.8125]
+
+
+@postgresql_only
+def test_mapa_clusters_too_many_cells(client, db_session):
+    params = {
+        "min_longitude": -180,
+        "min_latitude": -90,
+        "max_longitude": 180,
+        "max_latitude": 90,
+        "zoom": 12,
+    }
+    response = client.get("/fazendas/mapa/clusters", params=params)
+    assert response.status_code == 400
+
+
+@pytest.mark.skipif(not settings.is_spatialite, reason="Requires the SpatiaLite backend")
+def test_estatisticas_not_supported_on_spatialite(client, db_session):
+    response = client.get("/fazendas/estatisticas/estados")
+    assert response.status_code == 501
+
+
+def test_exportar_raio_geoparquet(client, fazenda):
+    import io
+    import json
+
+    import pyarrow.parquet as pq
+
+    data = {"latitude": 0, "longitude": 0, "raio_km": 10}
+    response = client.post("/fazendas/exportar/raio", json=data)
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert fazenda.gid in table.column("gid").to_pylist()
+    assert json.loads(table.schema.metadata[b"geo"])["primary_column"] == "geom"
+
+
+def test_exportar_area_arrow(client, fazenda):
+    import pyarrow as pa
+
+    data = {"bbox": [-0.5, -0.5, 0.5, 0.5]}
+    response = client.post("/fazendas/exportar/area?formato=arrow", json=data)
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("gid").to_pylist() == [fazenda.gid]
@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from geoalchemy2.shape import from_shape
+from shapely.geometry import Point, box
+
+from app.core.admission import get_admission_limiter
+from app.fazendas.routes import geofence as geofence_routes
+from app.fazendas.services.geofence_service import GeofenceTracker
+from main import app
+
+# Duas fazendas lado a lado, sobrepostas em 0.4 <= lon <= 0.6
+SHAPES = {1: box(0, 0, 0.6, 1), 2: box(0.4, 0, 1, 1)}
+FAZENDAS = {
+    gid: SimpleNamespace(gid=gid, cod_imovel="AB"[gid - 1], geom=from_shape(shape, srid=4326))
+    for gid, shape in SHAPES.items()
+}
+
+
+def fake_lookup(calls):
+    def lookup(latitude, longitude):
+        calls.append((latitude, longitude))
+        point = Point(longitude, latitude)
+        return [FAZENDAS[gid] for gid, shape in SHAPES.items() if shape.intersects(point)]
+
+    return lookup
+
+
+def events(eventos):
+    return [(e["event"], e["gid"]) for e in eventos]
+
+
+def test_enter_and_exit_with_local_checks():
+    calls = []
+    tracker = GeofenceTracker(fake_lookup(calls), recheck_every=100, max_devices=10)
+
+    assert events(tracker.update("d1", 0.5, 0.1)) == [("enter", 1)]
+    # Continua na fazenda 1: resolvido localmente, sem consulta
+    assert tracker.update("d1", 0.5, 0.2) == []
+    assert len(calls) == 1
+
+    # Sai da fazenda 1 e entra na 2: nova consulta indexada
+    assert events(tracker.update("d1", 0.5, 0.9)) == [("exit", 1), ("enter", 2)]
+    assert events(tracker.update("d1", 2.0, 2.0)) == [("exit", 2)]
+    assert len(calls) == 3
+    assert tracker.stats() == {"devices": 1, "local": 1, "lookups": 3}
+
+
+def test_overlap_exit_detected_locally_and_recheck_finds_new_farm():
+    calls = []
+    tracker = GeofenceTracker(fake_lookup(calls), recheck_every=2, max_devices=10)
+
+    assert events(tracker.update("d1", 0.5, 0.5)) == [("enter", 1), ("enter", 2)]
+    # Ainda na fazenda 1 (última encontrada); a saída da 2 é detectada localmente
+    assert events(tracker.update("d1", 0.5, 0.1)) == [("exit", 2)]
+    assert len(calls) == 1
+
+    # Volta à sobreposição; a entrada na 2 aparece na consulta periódica
+    assert tracker.update("d1", 0.5, 0.5) == []
+    assert events(tracker.update("d1", 0.5, 0.5)) == [("enter", 2)]
+    assert len(calls) == 2
+
+
+def test_device_limit():
+    tracker = GeofenceTracker(fake_lookup([]), recheck_every=10, max_devices=1)
+    tracker.update("d1", 2.0, 2.0)
+    try:
+        tracker.update("d2", 2.0, 2.0)
+    except ValueError as e:
+        assert "Limite" in str(e)
+    else:
+        raise AssertionError("device limit not enforced")
+
+
+def test_websocket_emits_events_and_errors(monkeypatch):
+    calls = []
+    monkeypatch.setattr(geofence_routes, "_buscar_fazendas", fake_lookup(calls))
+    client = TestClient(app)
+
+    with client.websocket_connect("/fazendas/geofence") as websocket:
+        websocket.send_json(
+            {"device_id": "d1", "latitude": 0.5, "longitude": 0.1, "timestamp": "t1"}
+        )
+        evento = websocket.receive_json()
+        assert evento == {
+            "event": "enter",
+            "device_id": "d1",
+            "gid": 1,
+            "cod_imovel": "A",
+            "latitude": 0.5,
+            "longitude": 0.1,
+            "timestamp": "t1",
+        }
+
+        websocket.send_json({"device_id": "d1", "latitude": 100, "longitude": 0.1})
+        erro = websocket.receive_json()
+        assert erro["event"] == "error"
+        assert erro["status_code"] == 400
+
+        websocket.send_json({"device_id": "d1", "latitude": 2.0, "longitude": 2.0})
+        assert websocket.receive_json()["event"] == "exit"
+
+    assert len(calls) == 2
+
+
+def test_websocket_lookup_goes_through_admission(monkeypatch):
+    calls = []
+    monkeypatch.setattr(geofence_routes, "_buscar_fazendas", fake_lookup(calls))
+    limiter = get_admission_limiter()
+    monkeypatch.setattr(limiter, "max_queue", 0)
+    monkeypatch.setattr(limiter, "_in_use", limiter.capacity)
+    client = TestClient(app)
+
+    with client.websocket_connect("/fazendas/geofence") as websocket:
+        # Capacidade esgotada: a consulta é rejeitada sem encerrar a conexão
+        websocket.send_json({"device_id": "d1", "latitude": 0.5, "longitude": 0.1})
+        erro = websocket.receive_json()
+        assert erro["event"] == "error"
+        assert erro["status_code"] == 503
+        assert calls == []
+
+        limiter._in_use = 0
+        websocket.send_json({"device_id": "d1", "latitude": 0.5, "longitude": 0.1})
+        assert websocket.receive_json()["event"] == "enter"
+        assert limiter.stats()["in_use"] == 0
+
+    assert len(calls) == 1
+
+
+def test_websocket_binary_message_is_rejected(monkeypatch):
+    monkeypatch.setattr(geofence_routes, "_buscar_fazendas", fake_lookup([]))
+    client = TestClient(app)
+
+    with client.websocket_connect("/fazendas/geofence") as websocket:
+        websocket.send_bytes(b'{"device_id": "d1", "latitude": 0.5, "longitude": 0.1}')
+        erro = websocket.receive_json()
+        assert erro["event"] == "error"
+        assert erro["status_code"] == 400
+
+        websocket.send_json({"device_id": "d1", "latitude": 0.5, "longitude": 0.1})
+        assert websocket.receive_json()["event"] == "enter"
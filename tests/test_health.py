@@ -0,0 +1,77 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.core.health import get_health_prober
+from main import app
+
+client = TestClient(app)
+
+
+def test_liveness():
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+
+def test_readiness_after_probe():
+    asyncio.run(get_health_prober().probe_once())
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    details = response.json()["details"]
+    assert details["database"]["status"] == "connected"
+    assert details["pool"]["saturated"] is False
+
+
+def test_health_reports_pool_and_latency():
+    asyncio.run(get_health_prober().probe_once())
+
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["database"] == "connected"
+    assert "utilization" in data["details"]["pool"]
+    assert "p95_ms" in data["details"]["queries"]
+
+
+def test_saturated_pool_defers_probe_until_state_is_unknown(monkeypatch):
+    from sqlalchemy import create_engine
+
+    from app.core.health import HealthProber
+
+    prober = HealthProber(
+        create_engine("sqlite://"),
+        interval=5.0,
+        timeout=2.0,
+        stale_after=30.0,
+        saturation_threshold=0.9,
+    )
+    asyncio.run(prober.probe_once())
+    assert prober.status()["status"] == "healthy"
+
+    checked_at = prober._state["checked_at"]
+    saturated = dict(prober.pool_status(), saturated=True)
+    monkeypatch.setattr(prober, "pool_status", lambda: saturated)
+    monkeypatch.setattr(
+        prober, "_probe_database", lambda: (_ for _ in ()).throw(AssertionError("probed"))
+    )
+    asyncio.run(prober.probe_once())
+
+    # Verificação adiada: o último resultado continua válido até HEALTH_STALE_AFTER
+    assert prober._state["checked_at"] == checked_at
+    status = prober.status()
+    assert status["status"] == "saturated"
+    assert status["ready"] is False
+    assert status["database"]["status"] == "connected"
+    assert status["database"]["probe_deferred"] is True
+
+    # Sem verificação por mais de HEALTH_STALE_AFTER: o banco passa a desconhecido,
+    # mesmo depois que o pool deixa de estar saturado
+    prober._state["checked_at"] -= 60
+    asyncio.run(prober.probe_once())
+    monkeypatch.setattr(prober, "pool_status", lambda: dict(saturated, saturated=False))
+    status = prober.status()
+    assert status["status"] == "saturated"
+    assert status["ready"] is False
+    assert status["database"]["status"] == "unknown"
@@ -0,0 +1,155 @@
+import csv
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.database import Base, engine
+from scripts import ingest_delta as ingest_delta_script
+from scripts.ingest_delta import COLUMNS, TOMBSTONE_COLUMN, ingest_delta
+
+settings = get_settings()
+
+postgresql_only = pytest.mark.skipif(
+    settings.is_spatialite, reason="Requires the PostgreSQL/PostGIS backend"
+)
+
+# Registros em um estado fictício, removidos ao fim de cada teste
+ESTADO = "XD"
+POLY_WKT = "MULTIPOLYGON(((20 20, 21 20, 21 21, 20 21, 20 20)))"
+
+
+def record(gid, dat_atuali="2024-01-01", **fields):
+    return {
+        "gid": gid,
+        "cod_imovel": f"XD-{gid}",
+        "cod_estado": ESTADO,
+        "municipio": "Municipio D",
+        "dat_atuali": dat_atuali,
+        "geom": POLY_WKT,
+        **fields,
+    }
+
+
+def write_delta(path, records, tombstones=False):
+    columns = ["gid", "cod_imovel", "cod_estado", "municipio", "dat_atuali", "geom"]
+    if tombstones:
+        columns.append(TOMBSTONE_COLUMN)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in records:
+            writer.writerow({TOMBSTONE_COLUMN: False, **row})
+    return str(path)
+
+
+def rows():
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(
+                "SELECT gid, municipio, dat_atuali FROM area_imovel_1 "
+                "WHERE cod_estado = :estado ORDER BY gid"
+            ),
+            {"estado": ESTADO},
+        )
+        return [tuple(row) for row in result]
+
+
+@pytest.fixture
+def cleanup():
+    Base.metadata.create_all(bind=engine)
+    yield
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM area_imovel_1 WHERE cod_estado = :estado"), {"estado": ESTADO})
+
+
+@postgresql_only
+def test_insert_update_and_skip_unchanged(tmp_path, cleanup):
+    delta = write_delta(tmp_path / "delta.csv", [record(9301), record(9302)])
+    assert ingest_delta(delta) == {"inserted": 2, "updated": 0, "deleted": 0}
+
+    # dat_atuali inalterado: o registro não é atualizado, mesmo com outros campos diferentes
+    delta = write_delta(
+        tmp_path / "delta.csv",
+        [record(9301, municipio="Outro"), record(9302, dat_atuali="2024-02-01", municipio="Novo")],
+    )
+    assert ingest_delta(delta) == {"inserted": 0, "updated": 1, "deleted": 0}
+    assert rows() == [(9301, "Municipio D", "2024-01-01"), (9302, "Novo", "2024-02-01")]
+
+
+@postgresql_only
+def test_partial_delta_keeps_unchanged_records(tmp_path, cleanup):
+    ingest_delta(write_delta(tmp_path / "base.csv", [record(9301), record(9302)]))
+
+    delta = write_delta(tmp_path / "delta.csv", [record(9303)])
+    assert ingest_delta(delta) == {"inserted": 1, "updated": 0, "deleted": 0}
+    assert [row[0] for row in rows()] == [9301, 9302, 9303]
+
+
+@postgresql_only
+def test_tombstone_deletes_record(tmp_path, cleanup):
+    ingest_delta(write_delta(tmp_path / "base.csv", [record(9301), record(9302)]))
+
+    delta = write_delta(
+        tmp_path / "delta.csv", [record(9302, **{TOMBSTONE_COLUMN: True})], tombstones=True
+    )
+    assert ingest_delta(delta) == {"inserted": 0, "updated": 0, "deleted": 1}
+    assert [row[0] for row in rows()] == [9301]
+
+
+@postgresql_only
+def test_remove_missing_with_full_snapshot(tmp_path, cleanup):
+    ingest_delta(write_delta(tmp_path / "base.csv", [record(9301), record(9302)]))
+
+    snapshot = write_delta(tmp_path / "snapshot.csv", [record(9301)])
+    assert ingest_delta(snapshot, delete_missing=True) == {
+        "inserted": 0,
+        "updated": 0,
+        "deleted": 1,
+    }
+    assert [row[0] for row in rows()] == [9301]
+
+
+@postgresql_only
+def test_json_delta(tmp_path, cleanup):
+    path = tmp_path / "delta.json"
+    path.write_text(json.dumps([record(9301), record(9302, **{TOMBSTONE_COLUMN: True})]))
+    assert ingest_delta(str(path)) == {"inserted": 1, "updated": 0, "deleted": 0}
+
+
+@postgresql_only
+def test_unknown_columns_rejected(tmp_path):
+    path = tmp_path / "delta.csv"
+    path.write_text("gid,coluna_inexistente\n1,x\n")
+    with pytest.raises(ValueError):
+        ingest_delta(str(path))
+
+
+@postgresql_only
+def test_upsert_without_dat_atuali_rejected(tmp_path, cleanup):
+    ingest_delta(write_delta(tmp_path / "base.csv", [record(9301), record(9302)]))
+
+    path = tmp_path / "delta.csv"
+    path.write_text(f"gid,cod_estado,municipio\n9301,{ESTADO},Outro\n")
+    with pytest.raises(ValueError):
+        ingest_delta(str(path))
+    assert rows()[0] == (9301, "Municipio D", "2024-01-01")
+
+    # Apenas remoções dispensam dat_atuali
+    path.write_text(f"gid,cod_estado,{TOMBSTONE_COLUMN}\n9302,{ESTADO},true\n")
+    assert ingest_delta(str(path)) == {"inserted": 0, "updated": 0, "deleted": 1}
+
+
+def test_spatialite_backend_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_delta_script.settings, "DB_BACKEND", "spatialite")
+    with pytest.raises(SystemExit):
+        ingest_delta(write_delta(tmp_path / "delta.csv", [record(9301)]))
+
+
+def test_json_source_includes_tombstone_column(tmp_path):
+    path = tmp_path / "delta.json"
+    path.write_text(json.dumps([record(9301, **{TOMBSTONE_COLUMN: True})]))
+    columns, stream = ingest_delta_script._read_source(str(path))
+    assert columns == COLUMNS + [TOMBSTONE_COLUMN]
+    assert next(csv.reader(stream))[-1] == "True"
@@ -0,0 +1,195 @@
+import csv
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import get_admission_limiter
+from app.core.config import get_settings
+from app.core.jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JobManager,
+    JobStore,
+)
+from app.fazendas.repositories.fazenda_repository import FazendaRepository
+from app.fazendas.routes import fazendas as fazendas_routes
+from app.fazendas.services import spatial_join_service
+from app.fazendas.services.spatial_join_service import RESULT_COLUMNS, SpatialJoinService
+from main import app
+
+
+def wait_for(store, job_id, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = store.read_status(job_id)
+        if status["status"] in (JOB_COMPLETED, JOB_FAILED):
+            return status
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_runs_and_reports_progress(tmp_path):
+    store = JobStore(str(tmp_path))
+    manager = JobManager(store, workers=1)
+    job_id = store.create()
+    seen = []
+
+    def process(jid, progress):
+        for processed in (10, 20):
+            progress(processed=processed)
+            seen.append(store.read_status(jid)["processed"])
+        return {"processed": 20, "matched": 5}
+
+    manager.submit(job_id, process)
+    status = wait_for(store, job_id)
+    manager.shutdown()
+
+    assert seen == [10, 20]
+    assert status["status"] == JOB_COMPLETED
+    assert status["matched"] == 5
+    assert status["started_at"] and status["finished_at"]
+
+
+def test_failed_job_records_error(tmp_path):
+    store = JobStore(str(tmp_path))
+    manager = JobManager(store, workers=1)
+    job_id = store.create()
+
+    def process(jid, progress):
+        raise RuntimeError("falhou")
+
+    manager.submit(job_id, process)
+    status = wait_for(store, job_id)
+    manager.shutdown()
+
+    assert status["status"] == JOB_FAILED
+    assert status["error"] == "falhou"
+
+
+def test_unknown_or_malformed_job_id(tmp_path):
+    store = JobStore(str(tmp_path))
+    assert store.read_status("0" * 32) is None
+    assert store.read_status("../etc") is None
+
+
+def test_cleanup_removes_only_expired_finished_jobs(tmp_path):
+    store = JobStore(str(tmp_path))
+    antigo = store.create()
+    store.update_status(antigo, status=JOB_COMPLETED, finished_at="2000-01-01T00:00:00+00:00")
+    recente = store.create()
+    store.update_status(recente, status=JOB_FAILED, finished_at=datetime.now(timezone.utc).isoformat())
+    pendente = store.create()
+
+    assert store.cleanup(retention_seconds=3600) == 1
+    assert store.read_status(antigo) is None
+    assert store.read_status(recente)["status"] == JOB_FAILED
+    assert store.read_status(pendente)["status"] == JOB_QUEUED
+
+
+def test_orphaned_jobs_marked_failed_on_start(tmp_path):
+    store = JobStore(str(tmp_path))
+    # Job da execução anterior, com o PID reutilizado pelo processo atual
+    orfao = store.create()
+    store.update_status(orfao, status=JOB_RUNNING)
+    # Job de outro processo ainda ativo
+    ativo = store.create()
+    store.update_status(ativo, pid=os.getppid())
+
+    manager = JobManager(store, workers=1)
+    manager.start(retention_seconds=3600, interval=3600)
+    manager.shutdown()
+
+    status = store.read_status(orfao)
+    assert status["status"] == JOB_FAILED
+    assert status["finished_at"] and status["error"]
+    assert store.read_status(ativo)["status"] == JOB_QUEUED
+
+
+@pytest.fixture
+def job_manager(tmp_path, monkeypatch):
+    manager = JobManager(JobStore(str(tmp_path)), workers=1)
+    monkeypatch.setattr(fazendas_routes, "get_job_manager", lambda: manager)
+    yield manager
+    manager.shutdown()
+
+
+def test_criar_job_endpoint(job_manager, monkeypatch):
+    monkeypatch.setattr(
+        SpatialJoinService,
+        "process",
+        staticmethod(lambda input_path, result_path, progress: {"processed": 2}),
+    )
+    monkeypatch.setattr(fazendas_routes, "JOBS_UPLOAD_BUFFER_BYTES", 8)
+    # Rotas de jobs não passam pelo controle de admissão, mesmo com a capacidade esgotada
+    limiter = get_admission_limiter()
+    monkeypatch.setattr(limiter, "_in_use", limiter.capacity)
+
+    content = b"id,latitude,longitude\n1,0,0\n2,5,5"
+    response = TestClient(app).post("/fazendas/jobs", content=content)
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == JOB_QUEUED
+    assert body["total"] == 2
+    with open(job_manager.store.input_path(body["id"]), "rb") as f:
+        assert f.read() == content
+
+    assert wait_for(job_manager.store, body["id"])["status"] == JOB_COMPLETED
+
+
+def test_criar_job_upload_too_large(job_manager, monkeypatch):
+    monkeypatch.setattr(fazendas_routes.settings, "JOBS_MAX_UPLOAD_MB", 0)
+
+    response = TestClient(app).post("/fazendas/jobs", content=b"latitude,longitude\n0,0\n")
+    assert response.status_code == 413
+    assert job_manager.store.job_ids() == []
+
+
+@pytest.mark.parametrize(
+    "content", [b"lat,lon\n0,0\n", "latitude,longitude\n0,0\n".encode("utf-16")]
+)
+def test_criar_job_invalid_file(job_manager, content):
+    response = TestClient(app).post("/fazendas/jobs", content=content)
+    assert response.status_code == 400
+    assert job_manager.store.job_ids() == []
+
+
+def test_spatial_join_process(tmp_path, monkeypatch):
+    class FakeSession:
+        def close(self):
+            pass
+
+    def find_by_points(self, points):
+        # A fazenda 1 contém os pontos com latitude positiva
+        return [(idx, 1, "A", "Municipio", "XA") for idx, latitude, _ in points if latitude > 0]
+
+    monkeypatch.setattr(spatial_join_service, "get_session_factory", lambda: FakeSession)
+    monkeypatch.setattr(spatial_join_service, "set_statement_timeout", lambda db, ms: None)
+    monkeypatch.setattr(FazendaRepository, "find_by_points", find_by_points)
+    monkeypatch.setattr(get_settings(), "JOBS_CHUNK_SIZE", 2)
+
+    input_path = tmp_path / "entrada.csv"
+    input_path.write_text("Latitude,Longitude\n1,1\n-1,1\nx,1\n95,0\n2,2\n", encoding="utf-8")
+    result_path = tmp_path / "resultado.csv"
+    reported = []
+
+    summary = SpatialJoinService.process(
+        str(input_path), str(result_path), lambda **fields: reported.append(fields)
+    )
+
+    assert summary == {"processed": 5, "matched": 2, "invalid": 2}
+    assert [fields["processed"] for fields in reported] == [2, 4, 5]
+    with open(result_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == RESULT_COLUMNS
+    assert rows[1:] == [
+        ["1", "1", "1", "1", "A", "Municipio", "XA", ""],
+        ["2", "-1", "1", "", "", "", "", ""],
+        ["3", "x", "1", "", "", "", "", "Coordenadas não numéricas"],
+        ["4", "95", "0", "", "", "", "", "Coordenadas fora dos limites"],
+        ["5", "2", "2", "1", "A", "Municipio", "XA", ""],
+    ]
@@ -0,0 +1,209 @@
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.singleflight import SingleFlight
+from app.fazendas.models_sqla import AreaImovel
+from app.fazendas.repositories.coalescing_repository import CoalescingFazendaRepository
+
+
+def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def query():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return ["resultado"]
+
+    results = []
+
+    def worker():
+        results.append(single_flight.do(("busca", 1), query))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(r is results[0] for r in results)
+    assert single_flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_sequential_calls_execute_again():
+    single_flight = SingleFlight()
+    assert single_flight.do("k", lambda: 1) == 1
+    assert single_flight.do("k", lambda: 2) == 2
+    assert single_flight.stats()["executions"] == 2
+
+
+def test_leader_exception_is_shared_unless_retried():
+    single_flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError("falhou")
+
+    errors = []
+
+    def leader():
+        with pytest.raises(RuntimeError):
+            single_flight.do("k", failing)
+
+    def follower():
+        try:
+            errors.append(single_flight.do("k", lambda: "ok", retry_on=lambda e: True))
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    started.wait()
+    follower_thread = threading.Thread(target=follower)
+    follower_thread.start()
+    leader_thread.join()
+    follower_thread.join()
+
+    assert errors == ["ok"]
+
+
+@pytest.fixture
+def coalescing(monkeypatch):
+    """Repositório coalescente com um SingleFlight próprio e consulta por ponto falsa."""
+    from app.fazendas.repositories import coalescing_repository
+    from app.fazendas.repositories.fazenda_repository import FazendaRepository
+
+    single_flight = SingleFlight()
+    monkeypatch.setattr(coalescing_repository, "get_single_flight", lambda: single_flight)
+
+    started = threading.Event()
+    calls = []
+    behaviour = {"fail_first": False}
+
+    def find_by_point(self, latitude, longitude):
+        calls.append((self.db, latitude, longitude))
+        started.set()
+        time.sleep(0.2)
+        if behaviour["fail_first"] and len(calls) == 1:
+            raise cancelled_error()
+        return [AreaImovel(gid=1, cod_imovel="A")]
+
+    monkeypatch.setattr(FazendaRepository, "find_by_point", find_by_point)
+    return SimpleNamespace(
+        single_flight=single_flight, started=started, calls=calls, behaviour=behaviour
+    )
+
+
+def cancelled_error():
+    # Erro de consulta interrompida, como o gerado por QueryCanceller no SQLite
+    return OperationalError("SELECT ...", {}, sqlite3.OperationalError("interrupted"))
+
+
+def run_leader_and_follower(started, leader, follower):
+    results = {}
+
+    def run(name, fn):
+        try:
+            results[name] = fn()
+        except Exception as e:
+            results[name] = e
+
+    leader_thread = threading.Thread(target=run, args=("leader", leader))
+    leader_thread.start()
+    started.wait()
+    follower_thread = threading.Thread(target=run, args=("follower", follower))
+    follower_thread.start()
+    leader_thread.join()
+    follower_thread.join()
+    return results
+
+
+def test_repository_shares_detached_results(coalescing):
+    leader_db, follower_db = MagicMock(), MagicMock()
+
+    results = run_leader_and_follower(
+        coalescing.started,
+        lambda: CoalescingFazendaRepository(leader_db).find_by_point(-21.68, -50.74),
+        lambda: CoalescingFazendaRepository(follower_db).find_by_point(-21.68, -50.74),
+    )
+
+    assert len(coalescing.calls) == 1
+    assert results["follower"] is results["leader"]
+    # As fazendas saem da sessão do líder antes de chegar às outras requisições
+    leader_db.expunge.assert_called_once_with(results["leader"][0])
+    follower_db.expunge.assert_not_called()
+
+
+def test_repository_key_rounds_coordinates(coalescing):
+    results = run_leader_and_follower(
+        coalescing.started,
+        lambda: CoalescingFazendaRepository(MagicMock()).find_by_point(-21.68, -50.74),
+        lambda: CoalescingFazendaRepository(MagicMock()).find_by_point(-21.68000000001, -50.74),
+    )
+    assert len(coalescing.calls) == 1
+    assert results["follower"] is results["leader"]
+
+    coalescing.calls.clear()
+    coalescing.started.clear()
+    run_leader_and_follower(
+        coalescing.started,
+        lambda: CoalescingFazendaRepository(MagicMock()).find_by_point(-21.68, -50.74),
+        lambda: CoalescingFazendaRepository(MagicMock()).find_by_point(-21.6801, -50.74),
+    )
+    assert len(coalescing.calls) == 2
+
+
+def test_repository_follower_retries_when_leader_is_cancelled(coalescing):
+    coalescing.behaviour["fail_first"] = True
+    follower_db = MagicMock()
+
+    results = run_leader_and_follower(
+        coalescing.started,
+        lambda: CoalescingFazendaRepository(MagicMock()).find_by_point(-21.68, -50.74),
+        lambda: CoalescingFazendaRepository(follower_db).find_by_point(-21.68, -50.74),
+    )
+
+    assert isinstance(results["leader"], OperationalError)
+    assert [fazenda.gid for fazenda in results["follower"]] == [1]
+    # A nova execução usa a sessão da própria requisição que aguardava
+    assert coalescing.calls[1][0] is follower_db
+
+
+def test_get_db_checks_out_connection_lazily(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import sessionmaker
+    from starlette.requests import Request
+
+    from app.core import database
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'lazy.db'}")
+    monkeypatch.setattr(database, "get_session_factory", lambda: sessionmaker(bind=engine))
+    monkeypatch.setattr(database.settings, "DB_BACKEND", "spatialite")
+    canceller = database.QueryCanceller()
+    request = Request({"type": "http", "headers": [], "state": {}})
+
+    dependency = database.get_db(request, canceller)
+    db = next(dependency)
+    assert engine.pool.checkedout() == 0
+
+    db.execute(text("SELECT 1"))
+    assert engine.pool.checkedout() == 1
+    assert canceller._dbapi_connection is not None
+
+    dependency.close()
+    assert engine.pool.checkedout() == 0
+    assert canceller._dbapi_connection is None
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import database
+from app.core.config import Settings
+from app.core.warmup import _prepare_rounds, warm_up
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_is_lazy():
+    code = (
+        "import json, sys\n"
+        "import main\n"
+        "from app.core.database import get_engine\n"
+        "print(json.dumps({'engine': get_engine.cache_info().currsize,"
+        " 'pyarrow': 'pyarrow' in sys.modules}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["engine"] == 0
+    assert result["pyarrow"] is False
+
+
+def test_warm_up_opens_pool_and_prepares_each_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warmup.db'}", pool_size=3)
+    prepared = []
+
+    def prepare(db):
+        prepared.append(db.execute(text("SELECT 1")).scalar())
+
+    report = warm_up(engine, connections=3, prepare=prepare, preload=["json"])
+
+    assert report["connections"] == 3
+    assert prepared == [1, 1, 1]
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+
+
+def test_warm_up_survives_database_errors(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'warmup.db'}")
+
+    report = warm_up(engine, connections=2)
+
+    assert "error" in report
+
+
+def test_warm_up_commits_so_prepared_statements_survive(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warmup.db'}", pool_size=2)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE marcas (id INTEGER)"))
+
+    def prepare(db):
+        db.execute(text("INSERT INTO marcas VALUES (1)"))
+
+    report = warm_up(engine, connections=2, prepare=prepare)
+
+    # Sem prepare_threshold (sqlite3), uma rodada por conexão
+    assert report["prepare_rounds"] == 1
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM marcas")).scalar() == 2
+
+
+def test_prepare_rounds_follow_driver_threshold():
+    def connection(**driver):
+        return SimpleNamespace(connection=SimpleNamespace(driver_connection=SimpleNamespace(**driver)))
+
+    # psycopg 3 prepara na execução seguinte às prepare_threshold execuções
+    assert _prepare_rounds(connection(prepare_threshold=5)) == 6
+    assert _prepare_rounds(connection(prepare_threshold=0)) == 1
+    assert _prepare_rounds(connection(prepare_threshold=None)) == 1
+    assert _prepare_rounds(connection()) == 1
+
+
+def test_postgresql_url_uses_psycopg3():
+    # prepare_threshold e o COMMIT ao fim das requisições dependem do psycopg 3
+    url = make_url(Settings(DB_BACKEND="postgresql").database_url)
+    assert url.get_dialect().driver == "psycopg"
+
+
+def test_get_db_ends_successful_requests_with_commit(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'commit.db'}")
+    monkeypatch.setattr(database, "get_session_factory", lambda: sessionmaker(bind=engine))
+    monkeypatch.setattr(database.settings, "DB_BACKEND", "spatialite")
+    ends = []
+    event.listen(engine, "commit", lambda conn: ends.append("commit"))
+    event.listen(engine, "rollback", lambda conn: ends.append("rollback"))
+    request = Request({"type": "http", "headers": [], "state": {}})
+
+    # Requisição concluída: COMMIT, que preserva as instruções preparadas do psycopg 3
+    dependency = database.get_db(request, database.QueryCanceller())
+    next(dependency).execute(text("SELECT 1"))
+    assert next(dependency, None) is None
+    assert ends == ["commit"]
+
+    # Requisição com erro: ROLLBACK
+    dependency = database.get_db(request, database.QueryCanceller())
+    next(dependency).execute(text("SELECT 1"))
+    try:
+        dependency.throw(RuntimeError("falhou"))
+    except RuntimeError:
+        pass
+    assert ends == ["commit", "rollback"]